@@ -1,9 +1,15 @@
 # INERTIA
 import tkinter as tk
 from tkinter import messagebox, ttk
-from collections import deque
+from collections import deque, namedtuple
+from collections.abc import Sequence
 import copy
 import random
+from array import array
+from bisect import bisect_left, bisect_right
+from multiprocessing import shared_memory
+
+from inertia_cache import default_cache
 
 # Cell types
 EMPTY = 0
@@ -11,6 +17,9 @@ GEM = 1
 MINE = 2
 STOP = 3
 
+# bytes.translate table dropping gems from a flat board
+_NO_GEMS = bytes.maketrans(bytes([GEM]), bytes([EMPTY]))
+
 # Directions - now includes diagonals
 UP = (-1, 0)
 DOWN = (1, 0)
@@ -24,6 +33,252 @@ DOWN_RIGHT = (1, 1)
 ALL_DIRECTIONS = [UP, DOWN, LEFT, RIGHT, UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT]
 CARDINAL_DIRECTIONS = [UP, DOWN, LEFT, RIGHT]
 
+# Viewport settings for the GUI board
+BASE_CELL_SIZE = 60
+MIN_CELL_SIZE = 4
+MAX_CELL_SIZE = 120
+DETAIL_CELL_SIZE = 24  # Below this, cells are drawn as plain coloured squares
+MAX_VIEW_SIZE = 720    # Largest canvas edge in pixels; bigger boards scroll
+
+# Per-turn features of a single slide, shared by all AI strategies
+MoveFeatures = namedtuple(
+    "MoveFeatures",
+    ["direction", "end_pos", "gems", "hit_mine", "path", "length", "risk", "valid"]
+)
+
+
+class SlidePath(Sequence):
+    """Lazy view of the cells visited by a slide, start cell included"""
+    __slots__ = ("start", "direction", "steps")
+    
+    def __init__(self, start, direction, steps):
+        self.start = start
+        self.direction = direction
+        self.steps = steps
+    
+    def __len__(self):
+        return self.steps + 1
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index <= self.steps:
+            raise IndexError("slide path index out of range")
+        return (self.start[0] + self.direction[0] * index,
+                self.start[1] + self.direction[1] * index)
+    
+    def __eq__(self, other):
+        # Compares equal to a list or tuple of the same cells, like the old list paths
+        if isinstance(other, (SlidePath, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+    
+    def __repr__(self):
+        return f"SlidePath({list(self)!r})"
+
+
+class SlideResult:
+    """
+    Scalar outcome of a slide; the path and the gem cells are only built
+    if asked for, and are valid until the board changes.
+    """
+    __slots__ = ("start", "direction", "end_pos", "steps", "gems", "hit_mine",
+                 "_gem_index", "_line")
+    
+    def __init__(self, start, direction, end_pos, steps, gems, hit_mine, gem_index, line):
+        self.start = start
+        self.direction = direction
+        self.end_pos = end_pos
+        self.steps = steps
+        self.gems = gems
+        self.hit_mine = hit_mine
+        self._gem_index = gem_index
+        self._line = line
+    
+    @property
+    def gem_cells(self):
+        if not self.gems:
+            return []
+        return self._gem_index.cells(*self._line)
+    
+    @property
+    def path(self):
+        return SlidePath(self.start, self.direction, self.steps)
+
+
+# Lines through the board: rows, columns, diagonals (r - c fixed) and
+# anti-diagonals (r + c fixed), with the direction sign along each line
+LINE_FAMILIES = {
+    RIGHT: (0, 1), LEFT: (0, -1),
+    DOWN: (1, 1), UP: (1, -1),
+    DOWN_RIGHT: (2, 1), UP_LEFT: (2, -1),
+    DOWN_LEFT: (3, 1), UP_RIGHT: (3, -1)
+}
+
+
+def _fenwick_build(values):
+    """Fenwick tree (1-based list) over values"""
+    tree = [0] + list(values)
+    n = len(tree)
+    for i in range(1, n):
+        j = i + (i & -i)
+        if j < n:
+            tree[j] += tree[i]
+    return tree
+
+
+# The helpers below work on the tree stored at tree[base:base + n]
+
+
+def _fenwick_add(tree, i, delta, base=0, n=None):
+    """Add delta to value i"""
+    if n is None:
+        n = len(tree) - base
+    i += 1
+    while i < n:
+        tree[base + i] += delta
+        i += i & -i
+
+
+def _fenwick_prefix(tree, i, base=0):
+    """Sum of values [0, i)"""
+    total = 0
+    while i > 0:
+        total += tree[base + i]
+        i &= i - 1
+    return total
+
+
+def _fenwick_search(tree, k, base=0, n=None):
+    """Smallest i with sum of values [0, i] > k"""
+    if n is None:
+        n = len(tree) - base
+    pos = 0
+    step = 1 << (n - 1).bit_length()
+    while step:
+        nxt = pos + step
+        if nxt < n and tree[base + nxt] <= k:
+            pos = nxt
+            k -= tree[base + nxt]
+        step >>= 1
+    return pos
+
+
+class GemLineIndex:
+    """
+    Live gem counts along every row, column and diagonal. Each line family
+    has a Fenwick tree over the map's gems in line order, so counting the
+    gems on a slide is O(log gems) whatever its length. The four trees
+    share one small array, which is the layout's own until the first gem
+    is collected.
+    """
+    __slots__ = ("layout", "tree")
+    
+    def __init__(self, layout, tree):
+        self.layout = layout
+        self.tree = tree
+    
+    @classmethod
+    def from_board(cls, layout, board):
+        """Index the gems left on board (a subset of the map's gems)"""
+        present = [
+            [1 if board[r][c] == GEM else 0 for r, c in cells]
+            for cells in layout.gem_line_cells
+        ]
+        if all(all(values) for values in present):
+            return cls.from_layout(layout)
+        return cls(layout, _gem_tree(present))
+    
+    @classmethod
+    def from_layout(cls, layout):
+        return cls(layout, layout.gem_tree)
+    
+    def remove(self, pos):
+        """Update the lines through a collected gem"""
+        layout = self.layout
+        if self.tree is layout.gem_tree:
+            self.tree = layout.gem_tree[:]
+        n = len(layout.gem_line_pos[0]) + 1
+        for family, slot in enumerate(layout.gem_slots[pos]):
+            _fenwick_add(self.tree, slot, -1, family * n, n)
+    
+    def _slots(self, family, lo, hi):
+        """Slot range [a, b) of the map's gems on line positions lo..hi"""
+        positions = self.layout.gem_line_pos[family]
+        return bisect_left(positions, lo), bisect_right(positions, hi)
+    
+    def count(self, family, lo, hi):
+        """Gems on line positions lo..hi of a family"""
+        a, b = self._slots(family, lo, hi)
+        if a == b:
+            return 0
+        base = family * (len(self.layout.gem_line_pos[0]) + 1)
+        return _fenwick_prefix(self.tree, b, base) - _fenwick_prefix(self.tree, a, base)
+    
+    def cells(self, family, lo, hi, sign=1):
+        """Gem cells on line positions lo..hi, in slide order"""
+        a, b = self._slots(family, lo, hi)
+        n = len(self.layout.gem_line_pos[0]) + 1
+        base = family * n
+        gem_cells = self.layout.gem_line_cells[family]
+        before = _fenwick_prefix(self.tree, a, base)
+        count = _fenwick_prefix(self.tree, b, base) - before
+        cells = [gem_cells[_fenwick_search(self.tree, before + k, base, n)] for k in range(count)]
+        if sign < 0:
+            # Slides towards lower line positions meet the gems in reverse
+            cells.reverse()
+        return cells
+
+
+class FlatBoard:
+    """Row access to a flat board, so board[r][c] works on one bytearray"""
+    __slots__ = ("cells", "cols")
+    
+    def __init__(self, cells, cols):
+        self.cells = cells
+        self.cols = cols
+    
+    def __len__(self):
+        return len(self.cells) // self.cols
+    
+    def __getitem__(self, r):
+        rows = len(self)
+        if r < 0:
+            r += rows
+        if not 0 <= r < rows:
+            raise IndexError("board row index out of range")
+        # Views are made on demand, so the game holds no per-row objects
+        return memoryview(self.cells)[r * self.cols:(r + 1) * self.cols]
+    
+    def __iter__(self):
+        for r in range(len(self)):
+            yield self[r]
+
+
+def _gem_tree(present):
+    """One array holding a Fenwick tree per line family over 0/1 gem flags"""
+    tree = []
+    for values in present:
+        tree += _fenwick_build(values)
+    # Unsigned 16-bit counts unless there are too many gems for them
+    return array("H" if len(present[0]) <= 0xFFFF else "I", tree)
+
+
+# Game events published to subscribers; player is "human" or "cpu"
+GameReset = namedtuple("GameReset", ["map_name"])
+MoveStarted = namedtuple("MoveStarted", ["player", "direction", "start"])
+BallMoved = namedtuple("BallMoved", ["player", "start", "end", "path"])
+GemCollected = namedtuple("GemCollected", ["player", "pos"])
+PlayerEliminated = namedtuple("PlayerEliminated", ["player", "pos"])
+GameOver = namedtuple("GameOver", ["human_score", "cpu_score", "human_eliminated", "cpu_eliminated"])
+
+# A board symmetry: cells maps (r, c) to its image, directions maps
+# moves into the transformed frame and back maps them out again
+Symmetry = namedtuple("Symmetry", ["name", "cells", "directions", "back"])
+
+
 # Rebalanced maps with better difficulty progression
 MAPS = {
     "Map 1 - Introduction": {
@@ -93,42 +348,306 @@ MAPS = {
 }
 
 
+class MapLayout:
+    """Read-only per-map data shared by every game on that map"""
+    
+    def __init__(self, map_name, template=None):
+        map_data = MAPS[map_name]
+        self.map_name = map_name
+        self.rows = map_data["rows"]
+        self.cols = map_data["cols"]
+        self.start = map_data["start"]
+        self.total_gems = len(map_data["gems"])
+        
+        # Flat board indexed by r * cols + c
+        if template is None:
+            cells = bytearray(self.rows * self.cols)
+            for cell_type, key in ((GEM, "gems"), (MINE, "mines"), (STOP, "stops")):
+                for r, c in map_data[key]:
+                    cells[r * self.cols + c] = cell_type
+            template = bytes(cells)
+        self.template = template
+        # Mines and stops only, to check board snapshots against
+        self.static_cells = bytes(template).translate(_NO_GEMS)
+        
+        # Everything below depends only on the map, so it is cached on disk
+        fields = default_cache().get_or_build("layout", map_data, lambda: self._build(map_data))
+        (self.near_mine, symmetries, self.line_cells, self.line_pos,
+         self.gem_line_pos, self.gem_line_cells, self.gem_slots, self.gem_tree) = fields
+        self.symmetries = [Symmetry(*symmetry) for symmetry in symmetries]
+        # Slide outcomes, filled in one line at a time as they are needed
+        self.slides = {}
+    
+    def _build(self, map_data):
+        """Compute the derived layout data. Returns: tuple of fields to cache"""
+        # Mines never move, so mine proximity is fixed for the whole game
+        self.near_mine = frozenset(
+            (r + dr, c + dc) for r, c in map_data["mines"]
+            for dr in (-1, 0, 1) for dc in (-1, 0, 1)
+            if 0 <= r + dr < self.rows and 0 <= c + dc < self.cols
+        )
+        self._build_lines()
+        # Plain tuples, so the cache does not depend on the module name
+        symmetries = [tuple(symmetry) for symmetry in find_symmetries(map_data)]
+        return (self.near_mine, symmetries, self.line_cells, self.line_pos,
+                self.gem_line_pos, self.gem_line_cells, self.gem_slots, self.gem_tree)
+    
+    def _build_lines(self):
+        """Order cells along each line family and index the initial gems"""
+        cells = [(r, c) for r in range(self.rows) for c in range(self.cols)]
+        orders = [
+            lambda p: (p[0], p[1]),
+            lambda p: (p[1], p[0]),
+            lambda p: (p[0] - p[1], p[0]),
+            lambda p: (p[0] + p[1], p[0])
+        ]
+        # Cells of one line are consecutive, so a slide covers a contiguous range
+        self.line_cells = [sorted(cells, key=order) for order in orders]
+        line_pos = {cell: [0] * len(orders) for cell in cells}
+        for family, ordered in enumerate(self.line_cells):
+            for i, cell in enumerate(ordered):
+                line_pos[cell][family] = i
+        self.line_pos = {cell: tuple(pos) for cell, pos in line_pos.items()}
+        
+        # The map's gems in line order per family; games index only these
+        gems = [cell for cell in cells if self.template[cell[0] * self.cols + cell[1]] == GEM]
+        self.gem_line_cells = []
+        self.gem_line_pos = []
+        gem_slots = {gem: [0] * len(orders) for gem in gems}
+        for family in range(len(orders)):
+            ordered = sorted(gems, key=lambda gem: self.line_pos[gem][family])
+            self.gem_line_cells.append(tuple(ordered))
+            self.gem_line_pos.append(tuple(self.line_pos[gem][family] for gem in ordered))
+            for slot, gem in enumerate(ordered):
+                gem_slots[gem][family] = slot
+        self.gem_slots = {gem: tuple(slots) for gem, slots in gem_slots.items()}
+        self.gem_tree = _gem_tree([[1] * len(gems) for _ in orders])
+    
+    def slide(self, pos, direction):
+        """
+        Gems never stop the ball, so where a slide ends is fixed per map.
+        Returns: (end_pos, steps, hit_mine, risk, line) where risk counts
+        near-mine cells on the path (start included) and line is the
+        (family, lo, hi, sign) range of cells passed over
+        """
+        entry = self.slides.get((pos, direction))
+        if entry is None:
+            self._build_slide_line(pos, direction)
+            entry = self.slides[(pos, direction)]
+        return entry
+    
+    def all_slides(self):
+        """Complete slide table. Returns: dict (pos, direction) -> slide"""
+        for direction in ALL_DIRECTIONS:
+            for r in range(self.rows):
+                for c in range(self.cols):
+                    if ((r, c), direction) not in self.slides:
+                        self._build_slide_line((r, c), direction)
+        return self.slides
+    
+    def _build_slide_line(self, pos, direction):
+        """
+        Fill in the slides in direction from every cell on pos's line, in
+        one backward pass: a slide that does not stop on the next cell
+        ends wherever the slide from that next cell ends.
+        """
+        rows, cols = self.rows, self.cols
+        template = self.template
+        near_mine = self.near_mine
+        line_pos = self.line_pos
+        slides = self.slides
+        family, sign = LINE_FAMILIES[direction]
+        dr, dc = direction
+        
+        # Start from the last cell of the line, where slides end at the edge
+        r, c = pos
+        while 0 <= r + dr < rows and 0 <= c + dc < cols:
+            r, c = r + dr, c + dc
+        
+        nxt = None
+        tail = None
+        while 0 <= r < rows and 0 <= c < cols:
+            pos = (r, c)
+            here = 1 if pos in near_mine else 0
+            if nxt is None:
+                tail = (pos, 0, False, here)
+            else:
+                cell = template[nxt[0] * cols + nxt[1]]
+                if cell == MINE or cell == STOP:
+                    tail = (nxt, 1, cell == MINE, here + (1 if nxt in near_mine else 0))
+                else:
+                    end_pos, steps, hit_mine, risk = tail
+                    tail = (end_pos, steps + 1, hit_mine, here + risk)
+            
+            steps = tail[1]
+            start = line_pos[pos][family]
+            if sign > 0:
+                line = (family, start + 1, start + steps, sign)
+            else:
+                line = (family, start - steps, start - 1, sign)
+            slides[(pos, direction)] = tail + (line,)
+            nxt = pos
+            r, c = r - dr, c - dc
+
+
+def _d4_transforms(rows, cols):
+    """(name, cell map) for every D4 symmetry that fits a rows x cols board"""
+    R, C = rows - 1, cols - 1
+    transforms = [
+        ("identity", lambda r, c: (r, c)),
+        ("flip_rows", lambda r, c: (R - r, c)),
+        ("flip_cols", lambda r, c: (r, C - c)),
+        ("rotate_180", lambda r, c: (R - r, C - c))
+    ]
+    if rows == cols:
+        transforms += [
+            ("transpose", lambda r, c: (c, r)),
+            ("anti_transpose", lambda r, c: (C - c, R - r)),
+            ("rotate_90", lambda r, c: (c, R - r)),
+            ("rotate_270", lambda r, c: (C - c, r))
+        ]
+    return transforms
+
+
+def find_symmetries(map_data):
+    """
+    Symmetries of a map's static layout (mines and stops).
+    Gems are part of the game state, so they are not required to match.
+    Returns: list of Symmetry, identity first
+    """
+    rows, cols = map_data["rows"], map_data["cols"]
+    mines = set(map_data["mines"])
+    stops = set(map_data["stops"])
+    symmetries = []
+    
+    for name, transform in _d4_transforms(rows, cols):
+        if ({transform(r, c) for r, c in mines} != mines or
+                {transform(r, c) for r, c in stops} != stops):
+            continue
+        cells = {(r, c): transform(r, c) for r in range(rows) for c in range(cols)}
+        # Transforms are affine, so a direction maps like a difference of cells
+        origin = transform(0, 0)
+        directions = {}
+        for dr, dc in ALL_DIRECTIONS:
+            tr, tc = transform(dr, dc)
+            directions[(dr, dc)] = (tr - origin[0], tc - origin[1])
+        back = {image: direction for direction, image in directions.items()}
+        symmetries.append(Symmetry(name, cells, directions, back))
+    
+    return symmetries
+
+
+def canonical_state(symmetries, pos, gems):
+    """
+    Canonical form of a (position, remaining gems) state, so that every
+    state equivalent under the map's symmetries gets the same key.
+    Returns: (key, symmetry) - symmetry.directions maps moves into the
+    canonical frame, symmetry.back maps them back to the real board
+    """
+    best_key = None
+    best_symmetry = None
+    for symmetry in symmetries:
+        cells = symmetry.cells
+        key = (cells[pos], tuple(sorted(cells[g] for g in gems)))
+        if best_key is None or key < best_key:
+            best_key = key
+            best_symmetry = symmetry
+    return best_key, best_symmetry
+
+
+_layouts = {}
+_templates_shm = None
+
+
+def get_layout(map_name):
+    """Get the cached MapLayout for a map, building it on first use"""
+    layout = _layouts.get(map_name)
+    if layout is None:
+        layout = _layouts[map_name] = MapLayout(map_name)
+    return layout
+
+
+def share_templates(map_names=None):
+    """
+    Publish board templates in one shared memory block for a process pool.
+    Returns: (shm, index) - keep shm alive, pass shm.name and index to attach_templates
+    """
+    index = {}
+    offset = 0
+    for map_name in map_names or MAPS:
+        size = len(get_layout(map_name).template)
+        index[map_name] = (offset, size)
+        offset += size
+    
+    shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    for map_name, (offset, size) in index.items():
+        shm.buf[offset:offset + size] = get_layout(map_name).template
+    return shm, index
+
+
+def attach_templates(shm_name, index):
+    """
+    Use board templates published by share_templates (pool worker initializer).
+    Returns: the attached shm, which must stay referenced while games use it
+    """
+    global _templates_shm
+    _templates_shm = shared_memory.SharedMemory(name=shm_name)
+    view = _templates_shm.buf.toreadonly()
+    for map_name, (offset, size) in index.items():
+        _layouts[map_name] = MapLayout(map_name, view[offset:offset + size])
+    return _templates_shm
+
+
 class InertiaGame:
-    def __init__(self, map_name="Map 1 - Introduction"):
+    # Games are kept slim so a server can host very many of them
+    __slots__ = (
+        "map_name", "flat_board", "cells", "board", "ball_pos",
+        "human_score", "cpu_score", "human_moves", "cpu_moves",
+        "game_over", "human_eliminated", "cpu_eliminated",
+        "_layout", "_gem_index", "_move_features", "_subscribers"
+    )
+    
+    def __init__(self, map_name="Map 1 - Introduction", flat_board=False):
         self.map_name = map_name
-        # Map-specific AI strategies
-        self.ai_strategies = {
-            "Map 1 - Introduction": self._ai_strategy_cautious,
-            "Map 2 - Corner Maze": self._ai_strategy_corners,
-            "Map 3 - Diamond Challenge": self._ai_strategy_center_out,
-            "Map 4 - Cross Roads": self._ai_strategy_cross,
-            "Map 5 - Spiral Trap": self._ai_strategy_spiral,
-            "Map 6 - Advanced Maze": self._ai_strategy_greedy,
-            "Map 7 - Expert Grid": self._ai_strategy_optimal,
-            "Map 8 - Master Challenge": self._ai_strategy_aggressive
-        }
+        # Flat boards are a single bytearray behind a FlatBoard, so
+        # board[r][c] still works and reset is a single buffer copy
+        self.flat_board = flat_board
+        self.cells = None
+        self._subscribers = None
         self.reset()
     
+    # Map data lives in the shared MapLayout rather than on each game
+    @property
+    def rows(self):
+        return self._layout.rows
+    
+    @property
+    def cols(self):
+        return self._layout.cols
+    
+    @property
+    def initial_pos(self):
+        return self._layout.start
+    
+    @property
+    def total_gems(self):
+        return self._layout.total_gems
+    
     def reset(self):
         """Reset game to initial state"""
-        map_data = MAPS[self.map_name]
-        self.rows = map_data["rows"]
-        self.cols = map_data["cols"]
-        self.initial_pos = map_data["start"]
-        
-        self.board = [[EMPTY for _ in range(self.cols)] for _ in range(self.rows)]
-        
-        # Place gems
-        for r, c in map_data["gems"]:
-            self.board[r][c] = GEM
-        
-        # Place mines
-        for r, c in map_data["mines"]:
-            self.board[r][c] = MINE
-        
-        # Place stops
-        for r, c in map_data["stops"]:
-            self.board[r][c] = STOP
+        layout = self._layout = get_layout(self.map_name)
+        
+        if not self.flat_board:
+            self.board = [
+                list(layout.template[r * self.cols:(r + 1) * self.cols])
+                for r in range(self.rows)
+            ]
+        elif (self.cells is not None and len(self.cells) == len(layout.template)
+              and self.board.cols == self.cols):
+            self.cells[:] = layout.template
+        else:
+            self.cells = bytearray(layout.template)
+            self.board = FlatBoard(self.cells, self.cols)
         
         self.ball_pos = self.initial_pos
         self.human_score = 0
@@ -138,32 +657,125 @@ class InertiaGame:
         self.game_over = False
         self.human_eliminated = False
         self.cpu_eliminated = False
-        self.total_gems = len(map_data["gems"])
+        self._gem_index = GemLineIndex.from_layout(layout)
+        self._move_features = None
+        if self._subscribers:
+            self._emit(GameReset(self.map_name))
+    
+    def subscribe(self, callback):
+        """Call callback(event) for every game event. Returns: callback"""
+        if self._subscribers is None:
+            self._subscribers = []
+        self._subscribers.append(callback)
+        return callback
+    
+    def unsubscribe(self, callback):
+        """Stop sending events to callback (ValueError if not subscribed)"""
+        if self._subscribers is None:
+            raise ValueError("callback is not subscribed")
+        self._subscribers.remove(callback)
+    
+    def _emit(self, event):
+        for callback in list(self._subscribers):
+            callback(event)
+    
+    def set_state(self, board, ball_pos):
+        """
+        Load an external board snapshot and ball position.
+        Flat boards also accept a flat buffer as produced by bytes(game.cells).
+        Only gem removals may differ from the map: slide outcomes are fixed
+        per map and only the map's gems are indexed, so a snapshot with other
+        mines, stops or extra gems raises ValueError.
+        """
+        if isinstance(board, (bytes, bytearray, memoryview)):
+            flat = bytes(board)
+        else:
+            flat = bytes(cell for row in board for cell in row)
+        if flat.translate(_NO_GEMS) != self._layout.static_cells:
+            raise ValueError("board snapshot does not match the mines and stops of " + self.map_name)
+        cols = self.cols
+        map_gems = sum(1 for r, c in self._layout.gem_line_cells[0] if flat[r * cols + c] == GEM)
+        if map_gems != flat.count(GEM):
+            raise ValueError("board snapshot has gems that are not on " + self.map_name)
+        if not self.flat_board:
+            # Always copy, so later moves never touch the caller's rows
+            self.board = [list(flat[r * cols:(r + 1) * cols]) for r in range(self.rows)]
+        else:
+            self.cells[:] = flat
+        self.ball_pos = ball_pos
+        self._gem_index = GemLineIndex.from_board(self._layout, self.board)
+        self._move_features = None
     
     def change_map(self, map_name):
         """Change to different map"""
         self.map_name = map_name
         self.reset()
     
-    def _ai_strategy_cautious(self):
-        """Cautious AI - prioritizes safety, avoids risky moves"""
+    def evaluate_moves(self):
+        """
+        Evaluate all 8 directions from the current position.
+        Computed once per turn and cached until the state changes.
+        Returns: dict of direction -> MoveFeatures
+        """
+        if self._move_features is None:
+            features = {}
+            for direction in ALL_DIRECTIONS:
+                result = self.slide(direction)
+                risk = self._layout.slide(self.ball_pos, direction)[3]
+                valid = not result.hit_mine and result.steps > 0
+                features[direction] = MoveFeatures(
+                    direction, result.end_pos, result.gems, result.hit_mine,
+                    result.path, result.steps + 1, risk, valid
+                )
+            self._move_features = features
+        return self._move_features
+    
+    def _best_move(self, score, directions=ALL_DIRECTIONS, floor=-1):
+        """
+        Pick the valid move with the highest score(features).
+        Only scores above floor count; ties keep the earliest direction.
+        Returns: (direction, path)
+        """
+        features = self.evaluate_moves()
         best_direction = None
-        best_score = -1
+        best_score = floor
         best_path = []
         
-        for direction in CARDINAL_DIRECTIONS:  # Only cardinal for safety
-            end_pos, gems, hit_mine, path = self.simulate_move(direction)
-            if not hit_mine and end_pos != self.ball_pos:
-                # Score: gems collected - risk factor
-                risk = len([p for p in path if self._is_near_mine(p)])
-                score = gems * 10 - risk * 2
-                if score > best_score:
+        for direction in directions:
+            move = features[direction]
+            if move.valid:
+                move_score = score(move)
+                if move_score > best_score:
                     best_direction = direction
-                    best_score = score
-                    best_path = path
+                    best_score = move_score
+                    best_path = move.path
         
         return best_direction, best_path
     
+    def _score_cautious(self, move):
+        """Score: gems collected - risk factor"""
+        return move.gems * 10 - move.risk * 2
+    
+    def _score_cross(self, move):
+        """Score: gems collected, bonus for staying on cross lines"""
+        score = move.gems * 10
+        if move.end_pos[0] == self.rows // 2 or move.end_pos[1] == self.cols // 2:
+            score += 5
+        return score
+    
+    def _score_greedy(self, move):
+        """Score: gems collected"""
+        return move.gems
+    
+    def _score_aggressive(self, move):
+        """Score: prioritize gems heavily, bonus for longer moves"""
+        return move.gems * 15 + move.length
+    
+    def _ai_strategy_cautious(self):
+        """Cautious AI - prioritizes safety, avoids risky moves"""
+        # Only cardinal for safety
+        return self._best_move(self._score_cautious, CARDINAL_DIRECTIONS)
+    
     def _ai_strategy_corners(self):
         """Corner-focused AI - heads to corners first"""
         corners = [(0, 0), (0, self.cols-1), (self.rows-1, 0), (self.rows-1, self.cols-1)]
@@ -191,27 +803,7 @@ class InertiaGame:
     
     def _ai_strategy_cross(self):
         """Cross pattern AI - follows cross lines"""
-        mid_row = self.rows // 2
-        mid_col = self.cols // 2
-        
-        # Prefer moves along cross lines
-        best_direction = None
-        best_score = -1
-        best_path = []
-        
-        for direction in ALL_DIRECTIONS:
-            end_pos, gems, hit_mine, path = self.simulate_move(direction)
-            if not hit_mine and end_pos != self.ball_pos:
-                score = gems * 10
-                # Bonus for staying on cross lines
-                if end_pos[0] == mid_row or end_pos[1] == mid_col:
-                    score += 5
-                if score > best_score:
-                    best_direction = direction
-                    best_score = score
-                    best_path = path
-        
-        return best_direction, best_path
+        return self._best_move(self._score_cross)
     
     def _ai_strategy_spiral(self):
         """Spiral AI - moves in spiral pattern from outside to inside"""
@@ -229,19 +821,7 @@ class InertiaGame:
     
     def _ai_strategy_greedy(self):
         """Greedy AI - always takes move with most gems"""
-        best_direction = None
-        best_gems = 0
-        best_path = []
-        
-        for direction in ALL_DIRECTIONS:
-            end_pos, gems, hit_mine, path = self.simulate_move(direction)
-            if not hit_mine and end_pos != self.ball_pos:
-                if gems > best_gems or (gems == best_gems and best_direction is None):
-                    best_direction = direction
-                    best_gems = gems
-                    best_path = path
-        
-        return best_direction, best_path
+        return self._best_move(self._score_greedy)
     
     def _ai_strategy_optimal(self):
         """Optimal AI - uses BFS to find best path"""
@@ -286,162 +866,133 @@ class InertiaGame:
     
     def _ai_strategy_aggressive(self):
         """Aggressive AI - uses diagonals and takes risks"""
-        best_direction = None
-        best_score = -1
-        best_path = []
-        
-        for direction in ALL_DIRECTIONS:  # All 8 directions
-            end_pos, gems, hit_mine, path = self.simulate_move(direction)
-            if not hit_mine and end_pos != self.ball_pos:
-                # Aggressive scoring - prioritize gems heavily
-                score = gems * 15 + len(path)  # Bonus for longer moves
-                if score > best_score:
-                    best_direction = direction
-                    best_score = score
-                    best_path = path
-        
-        return best_direction, best_path
-    
-    def _is_near_mine(self, pos):
-        """Check if position is adjacent to a mine"""
-        r, c = pos
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                nr, nc = r + dr, c + dc
-                if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                    if self.board[nr][nc] == MINE:
-                        return True
-        return False
+        return self._best_move(self._score_aggressive)
     
     def _move_towards_target(self, target):
         """Find best move towards a target position"""
-        best_direction = None
-        best_distance = float('inf')
-        best_path = []
-        
-        for direction in ALL_DIRECTIONS:
-            end_pos, gems, hit_mine, path = self.simulate_move(direction)
-            if not hit_mine and end_pos != self.ball_pos:
-                distance = abs(end_pos[0] - target[0]) + abs(end_pos[1] - target[1])
-                score = distance - gems * 100  # Heavily prioritize gems
-                if score < best_distance:
-                    best_direction = direction
-                    best_distance = score
-                    best_path = path
+        def score(move):
+            distance = abs(move.end_pos[0] - target[0]) + abs(move.end_pos[1] - target[1])
+            return move.gems * 100 - distance  # Heavily prioritize gems
         
-        return best_direction, best_path
+        return self._best_move(score, floor=float('-inf'))
+    
+    def slide(self, direction, start_pos=None):
+        """
+        Slide in given direction from start_pos (default: current position).
+        Table lookup for the end position plus an O(log n) gem count.
+        Returns: SlideResult
+        """
+        start = self.ball_pos if start_pos is None else start_pos
+        end_pos, steps, hit_mine, _, line = self._layout.slide(start, direction)
+        gems = self._gem_index.count(line[0], line[1], line[2]) if steps else 0
+        return SlideResult(start, direction, end_pos, steps, gems, hit_mine,
+                           self._gem_index, line)
     
     def _simulate_move_from(self, start_pos, direction, already_collected):
         """
         Simulate a move from given position, considering already collected gems.
         Returns: (end_pos, new_gems_set, hit_mine, path)
         """
-        dr, dc = direction
-        r, c = start_pos
-        gems_on_path = set()
-        path = [(r, c)]
-        hit_mine = False
-        
-        while True:
-            next_r, next_c = r + dr, c + dc
-            
-            if next_r < 0 or next_r >= self.rows or next_c < 0 or next_c >= self.cols:
-                break
-            
-            r, c = next_r, next_c
-            path.append((r, c))
-            
-            if self.board[r][c] == GEM and (r, c) not in already_collected:
-                gems_on_path.add((r, c))
-            elif self.board[r][c] == MINE:
-                hit_mine = True
-                break
-            elif self.board[r][c] == STOP:
-                break
-        
-        return (r, c), frozenset(gems_on_path), hit_mine, path
+        result = self.slide(direction, start_pos)
+        gems_on_path = frozenset(result.gem_cells).difference(already_collected)
+        return result.end_pos, gems_on_path, result.hit_mine, result.path
     
     def simulate_move(self, direction):
         """
         Simulate a slide in given direction from current position.
         Returns: (end_pos, gems_collected, hit_mine, path)
         """
-        dr, dc = direction
-        r, c = self.ball_pos
-        gems = 0
-        path = [(r, c)]
-        hit_mine = False
-        
-        while True:
-            next_r, next_c = r + dr, c + dc
-            
-            if next_r < 0 or next_r >= self.rows or next_c < 0 or next_c >= self.cols:
-                break
-            
-            r, c = next_r, next_c
-            path.append((r, c))
-            
-            if self.board[r][c] == GEM:
-                gems += 1
-            elif self.board[r][c] == MINE:
-                hit_mine = True
-                break
-            elif self.board[r][c] == STOP:
-                break
-        
-        return (r, c), gems, hit_mine, path
+        result = self.slide(direction)
+        return result.end_pos, result.gems, result.hit_mine, result.path
     
     def make_move(self, direction, is_human=True):
         """
-        Execute a move for human or CPU.
-        Returns: (success, gems_collected, path, hit_mine)
+        Execute a move for human or CPU, publishing events to subscribers.
+        Returns: (success, gems_collected, path, hit_mine) - path is a
+        SlidePath sequence of (row, col) cells; use list(path) to serialise it
         """
         if self.game_over:
             return False, 0, [], False
         
-        end_pos, gems, hit_mine, path = self.simulate_move(direction)
+        result = self.slide(direction)
+        player = "human" if is_human else "cpu"
         
         # If hit mine, player is eliminated
-        if hit_mine:
+        if result.hit_mine:
             if is_human:
                 self.human_eliminated = True
             else:
                 self.cpu_eliminated = True
             self.game_over = True
-            return False, 0, path, True
+            if self._subscribers:
+                self._emit(MoveStarted(player, direction, self.ball_pos))
+                self._emit(PlayerEliminated(player, result.end_pos))
+                self._emit_game_over()
+            return False, 0, result.path, True
         
-        if end_pos == self.ball_pos:
+        if result.steps == 0:
             return False, 0, [], False
         
-        self.ball_pos = end_pos
+        if self._subscribers:
+            self._emit(MoveStarted(player, direction, self.ball_pos))
+            self._emit(BallMoved(player, self.ball_pos, result.end_pos, result.path))
+        
+        self.ball_pos = result.end_pos
+        self._move_features = None
         
         if is_human:
             self.human_moves += 1
         else:
             self.cpu_moves += 1
         
-        # Collect gems along path
-        for r, c in path[1:]:
-            if self.board[r][c] == GEM:
+        # Collect the gems found during the slide
+        cells = self.cells
+        cols = self.cols
+        for r, c in result.gem_cells:
+            if cells is not None:
+                cells[r * cols + c] = EMPTY
+            else:
                 self.board[r][c] = EMPTY
-                if is_human:
-                    self.human_score += 1
-                else:
-                    self.cpu_score += 1
+            self._gem_index.remove((r, c))
+            if self._subscribers:
+                self._emit(GemCollected(player, (r, c)))
+        if is_human:
+            self.human_score += result.gems
+        else:
+            self.cpu_score += result.gems
         
         # Check win condition
         if self.human_score + self.cpu_score >= self.total_gems:
             self.game_over = True
+            if self._subscribers:
+                self._emit_game_over()
         
-        return True, gems, path, False
+        return True, result.gems, result.path, False
+    
+    def _emit_game_over(self):
+        self._emit(GameOver(self.human_score, self.cpu_score,
+                            self.human_eliminated, self.cpu_eliminated))
     
     def get_cpu_move(self):
         """
         Get CPU move using map-specific strategy.
         """
         # Use the AI strategy specific to this map
-        strategy_func = self.ai_strategies.get(self.map_name, self._ai_strategy_greedy)
-        return strategy_func()
+        strategy_func = self.ai_strategies.get(self.map_name, InertiaGame._ai_strategy_greedy)
+        return strategy_func(self)
+    
+    # Map-specific AI strategies, shared by all games (plain functions,
+    # so no game holds bound methods referring back to itself)
+    ai_strategies = {
+        "Map 1 - Introduction": _ai_strategy_cautious,
+        "Map 2 - Corner Maze": _ai_strategy_corners,
+        "Map 3 - Diamond Challenge": _ai_strategy_center_out,
+        "Map 4 - Cross Roads": _ai_strategy_cross,
+        "Map 5 - Spiral Trap": _ai_strategy_spiral,
+        "Map 6 - Advanced Maze": _ai_strategy_greedy,
+        "Map 7 - Expert Grid": _ai_strategy_optimal,
+        "Map 8 - Master Challenge": _ai_strategy_aggressive
+    }
 
 
 class InertiaGUI:
@@ -453,8 +1004,12 @@ class InertiaGUI:
         # Start with random map
         random_map = random.choice(list(MAPS.keys()))
         self.game = InertiaGame(random_map)
-        self.cell_size = 60
+        self.cell_size = BASE_CELL_SIZE
         self.animating = False
+        self._redraw_pending = False
+        # Board changes from game events, applied once animations finish
+        self.pending_events = []
+        self.game.subscribe(self._on_game_event)
         self.waiting_for_cpu = False
         
         self._create_widgets()
@@ -567,9 +1122,18 @@ class InertiaGUI:
             bg="#e8f4f8",
             highlightthickness=0
         )
-        self.canvas.pack()
+        # Scrollbars only show up when the board is larger than the viewport
+        self.x_scroll = ttk.Scrollbar(canvas_container, orient=tk.HORIZONTAL, command=self._scroll_x)
+        self.y_scroll = ttk.Scrollbar(canvas_container, orient=tk.VERTICAL, command=self._scroll_y)
+        self.canvas.config(xscrollcommand=self.x_scroll.set, yscrollcommand=self.y_scroll.set)
+        self.canvas.grid(row=0, column=0)
         self.canvas.bind("<Button-1>", self.mouse_click)
         
+        # Mouse wheel scrolls, Shift+wheel scrolls sideways, Ctrl+wheel zooms
+        self.canvas.bind("<MouseWheel>", lambda e: self._wheel(e, -1 if e.delta > 0 else 1))
+        self.canvas.bind("<Button-4>", lambda e: self._wheel(e, -1))
+        self.canvas.bind("<Button-5>", lambda e: self._wheel(e, 1))
+        
         # Instructions with better styling
         inst_frame = tk.Frame(self.root, bg="#1a1a2e", pady=10)
         inst_frame.pack()
@@ -579,7 +1143,8 @@ class InertiaGUI:
             ("Arrow Keys / WASD", "#ffffff", "normal"),
             ("or", "#a8dadc", "normal"),
             ("Click/Drag Mouse", "#ffffff", "normal"),
-            ("(8 Directions!)", "#00d4ff", "normal")
+            ("(8 Directions!)", "#00d4ff", "normal"),
+            ("+/- Zoom", "#a8dadc", "normal")
         ]
         
         for text, color, weight in instructions:
@@ -638,15 +1203,112 @@ class InertiaGUI:
         self.root.bind("<Prior>", lambda e: self.human_move(UP_RIGHT))   # 9
         self.root.bind("<End>", lambda e: self.human_move(DOWN_LEFT))    # 1
         self.root.bind("<Next>", lambda e: self.human_move(DOWN_RIGHT))  # 3
+        
+        # Zoom
+        self.root.bind("<plus>", lambda e: self.zoom(2))
+        self.root.bind("<equal>", lambda e: self.zoom(2))
+        self.root.bind("<minus>", lambda e: self.zoom(0.5))
+        self.root.bind("<Key-0>", lambda e: self.zoom(BASE_CELL_SIZE / self.cell_size))
+    
+    def _wheel(self, event, step):
+        """Scroll or zoom with the mouse wheel"""
+        if event.state & 0x4:  # Control
+            self.zoom(0.5 if step > 0 else 2)
+        elif event.state & 0x1:  # Shift
+            self._scroll_x("scroll", step, "units")
+        else:
+            self._scroll_y("scroll", step, "units")
+    
+    def _scroll_x(self, *args):
+        self.canvas.xview(*args)
+        self._schedule_redraw()
+    
+    def _scroll_y(self, *args):
+        self.canvas.yview(*args)
+        self._schedule_redraw()
+    
+    def _schedule_redraw(self):
+        """Redraw the visible cells once the current event batch is done"""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.root.after_idle(self._redraw)
+    
+    def _redraw(self):
+        self._redraw_pending = False
+        self.draw_board()
+    
+    def zoom(self, factor):
+        """Change cell size by factor, keeping the ball in view"""
+        cell_size = max(MIN_CELL_SIZE, min(MAX_CELL_SIZE, round(self.cell_size * factor)))
+        if cell_size == self.cell_size:
+            return
+        self.cell_size = cell_size
+        self._configure_viewport()
+        self._center_on(*self.game.ball_pos)
+        self.draw_board()
+    
+    def _configure_viewport(self):
+        """Size the canvas and scroll region for the current map and zoom"""
+        board_width = self.game.cols * self.cell_size
+        board_height = self.game.rows * self.cell_size
+        self.canvas.config(
+            width=min(board_width, MAX_VIEW_SIZE),
+            height=min(board_height, MAX_VIEW_SIZE),
+            scrollregion=(0, 0, board_width, board_height),
+            xscrollincrement=self.cell_size,
+            yscrollincrement=self.cell_size
+        )
+        if board_width > MAX_VIEW_SIZE:
+            self.x_scroll.grid(row=1, column=0, sticky="ew")
+        else:
+            self.x_scroll.grid_remove()
+        if board_height > MAX_VIEW_SIZE:
+            self.y_scroll.grid(row=0, column=1, sticky="ns")
+        else:
+            self.y_scroll.grid_remove()
+    
+    def _visible_cells(self):
+        """Range of rows and columns inside the viewport: (r0, r1, c0, c1)"""
+        x0 = self.canvas.canvasx(0)
+        y0 = self.canvas.canvasy(0)
+        width = int(self.canvas.cget("width"))
+        height = int(self.canvas.cget("height"))
+        c0 = max(0, int(x0 // self.cell_size))
+        r0 = max(0, int(y0 // self.cell_size))
+        c1 = min(self.game.cols, int((x0 + width) // self.cell_size) + 1)
+        r1 = min(self.game.rows, int((y0 + height) // self.cell_size) + 1)
+        return r0, r1, c0, c1
+    
+    def _center_on(self, r, c):
+        """Scroll so that cell (r, c) is in the middle of the viewport"""
+        board_width = self.game.cols * self.cell_size
+        board_height = self.game.rows * self.cell_size
+        width = int(self.canvas.cget("width"))
+        height = int(self.canvas.cget("height"))
+        x = (c + 0.5) * self.cell_size - width / 2
+        y = (r + 0.5) * self.cell_size - height / 2
+        self.canvas.xview_moveto(max(0, x) / board_width)
+        self.canvas.yview_moveto(max(0, y) / board_height)
+    
+    def _keep_in_view(self, r, c):
+        """Scroll if cell (r, c) is near the viewport edge. Returns: True if scrolled"""
+        r0, r1, c0, c1 = self._visible_cells()
+        # A cell on the board edge counts as in view once that edge is shown
+        row_ok = (r > r0 or r0 == 0) and (r < r1 - 2 or r1 == self.game.rows)
+        col_ok = (c > c0 or c0 == 0) and (c < c1 - 2 or c1 == self.game.cols)
+        if row_ok and col_ok:
+            return False
+        self._center_on(r, c)
+        return True
     
     def mouse_click(self, event):
         """Handle mouse click with 8-directional movement"""
         if self.animating or self.waiting_for_cpu or self.game.game_over:
             return
         
-        # Convert click to grid coordinates
-        col = event.x // self.cell_size
-        row = event.y // self.cell_size
+        # Convert click to grid coordinates (accounting for scroll)
+        col = int(self.canvas.canvasx(event.x) // self.cell_size)
+        row = int(self.canvas.canvasy(event.y) // self.cell_size)
         
         if row < 0 or row >= self.game.rows or col < 0 or col >= self.game.cols:
             return
@@ -686,135 +1348,201 @@ class InertiaGUI:
             self.human_move(direction)
     
     def draw_board(self):
-        """Draw the game board with enhanced visuals"""
+        """Draw the cells inside the viewport with enhanced visuals"""
         self.canvas.delete("all")
-        
-        # Adjust canvas size
-        canvas_width = self.game.cols * self.cell_size
-        canvas_height = self.game.rows * self.cell_size
-        self.canvas.config(width=canvas_width, height=canvas_height)
-        
-        # Draw checkered background
-        for r in range(self.game.rows):
-            for c in range(self.game.cols):
-                x = c * self.cell_size
-                y = r * self.cell_size
-                color = "#f0f8ff" if (r + c) % 2 == 0 else "#e1f0fa"
-                self.canvas.create_rectangle(
-                    x, y, x + self.cell_size, y + self.cell_size,
-                    fill=color, outline=""
-                )
-        
-        # Draw grid lines
-        for i in range(self.game.rows + 1):
-            y = i * self.cell_size
-            self.canvas.create_line(0, y, canvas_width, y, fill="#c0d8e8", width=1)
-        
-        for j in range(self.game.cols + 1):
-            x = j * self.cell_size
-            self.canvas.create_line(x, 0, x, canvas_height, fill="#c0d8e8", width=1)
-        
-        # Draw cells with enhanced graphics
-        for r in range(self.game.rows):
-            for c in range(self.game.cols):
-                x = c * self.cell_size
-                y = r * self.cell_size
-                cx, cy = x + self.cell_size // 2, y + self.cell_size // 2
-                
-                if self.game.board[r][c] == GEM:
-                    # Enhanced gem with glow effect
-                    size = self.cell_size // 3
-                    # Glow
-                    self.canvas.create_oval(
-                        cx - size - 3, cy - size - 3,
-                        cx + size + 3, cy + size + 3,
-                        fill="#80d4ff", outline=""
-                    )
-                    # Diamond shape
-                    self.canvas.create_polygon(
-                        cx, cy - size,
-                        cx + size, cy,
-                        cx, cy + size,
-                        cx - size, cy,
-                        fill="#00aaff", outline="#0088cc", width=2
-                    )
-                    # Highlight
-                    self.canvas.create_polygon(
-                        cx, cy - size,
-                        cx + size//2, cy - size//2,
-                        cx, cy,
-                        cx - size//2, cy - size//2,
-                        fill="#66ccff", outline=""
-                    )
-                    
-                elif self.game.board[r][c] == MINE:
-                    # Enhanced mine with danger symbol
-                    margin = self.cell_size // 5
-                    # Red circle background
-                    self.canvas.create_oval(
-                        cx - margin * 1.5, cy - margin * 1.5,
-                        cx + margin * 1.5, cy + margin * 1.5,
-                        fill="#ff3333", outline="#cc0000", width=2
-                    )
-                    # X mark
-                    m = margin
-                    self.canvas.create_line(
-                        cx - m, cy - m, cx + m, cy + m,
-                        fill="white", width=3
-                    )
-                    self.canvas.create_line(
-                        cx + m, cy - m, cx - m, cy + m,
-                        fill="white", width=3
-                    )
-                    
-                elif self.game.board[r][c] == STOP:
-                    # Enhanced stop sign
-                    radius = self.cell_size // 3
-                    # Octagon shape
-                    points = []
-                    for i in range(8):
-                        angle = i * 3.14159 * 2 / 8
-                        px = cx + radius * 0.9 * (1 if i % 2 == 0 else 0.7) * (1 if i < 4 else -1) * abs(((i + 1) % 4 - 1.5))
-                        py = cy + radius * 0.9 * (1 if i % 2 == 0 else 0.7) * (1 if 1 <= i < 5 else -1) * abs(((i - 0.5) % 4 - 1.5))
-                    
-                    self.canvas.create_oval(
-                        cx - radius, cy - radius,
-                        cx + radius, cy + radius,
-                        fill="#ff6b6b", outline="#cc0000", width=3
-                    )
+        # Mid-animation the board already holds the move's result: keep
+        # showing the gems it collects until apply_events() removes them
+        shown_gems = set()
+        if self.animating:
+            shown_gems = {event.pos for event in self.pending_events
+                          if isinstance(event, GemCollected)}
+        else:
+            self.pending_events.clear()
+        
+        # Adjust canvas size on map change
+        if self.canvas.cget("scrollregion") != self._scroll_region():
+            self._configure_viewport()
+            self._center_on(*self.game.ball_pos)
+        
+        r0, r1, c0, c1 = self._visible_cells()
+        x0, x1 = c0 * self.cell_size, c1 * self.cell_size
+        y0, y1 = r0 * self.cell_size, r1 * self.cell_size
+        
+        if self.cell_size < DETAIL_CELL_SIZE:
+            # Zoomed out: one background plus a plain square per object
+            self.canvas.create_rectangle(x0, y0, x1, y1, fill="#f0f8ff", outline="")
+            colors = {GEM: "#00aaff", MINE: "#ff3333", STOP: "#ff6b6b"}
+            for r in range(r0, r1):
+                row = self.game.board[r]
+                for c in range(c0, c1):
+                    color = colors.get(GEM if (r, c) in shown_gems else row[c])
+                    if color:
+                        x = c * self.cell_size
+                        y = r * self.cell_size
+                        self.canvas.create_rectangle(
+                            x, y, x + self.cell_size, y + self.cell_size,
+                            fill=color, outline="", tags=self._cell_tag(r, c)
+                        )
+        else:
+            # Draw checkered background
+            for r in range(r0, r1):
+                for c in range(c0, c1):
+                    x = c * self.cell_size
+                    y = r * self.cell_size
+                    color = "#f0f8ff" if (r + c) % 2 == 0 else "#e1f0fa"
                     self.canvas.create_rectangle(
-                        cx - radius * 0.6, cy - radius * 0.15,
-                        cx + radius * 0.6, cy + radius * 0.15,
-                        fill="white", outline=""
+                        x, y, x + self.cell_size, y + self.cell_size,
+                        fill=color, outline=""
                     )
+            
+            # Draw grid lines
+            for i in range(r0, r1 + 1):
+                y = i * self.cell_size
+                self.canvas.create_line(x0, y, x1, y, fill="#c0d8e8", width=1)
+            
+            for j in range(c0, c1 + 1):
+                x = j * self.cell_size
+                self.canvas.create_line(x, y0, x, y1, fill="#c0d8e8", width=1)
+            
+            # Draw cells with enhanced graphics
+            for r in range(r0, r1):
+                for c in range(c0, c1):
+                    self._draw_cell(r, c, GEM if (r, c) in shown_gems else None)
         
         # Draw ball with 3D effect
         if self.game.ball_pos:
-            r, c = self.game.ball_pos
-            x = c * self.cell_size
-            y = r * self.cell_size
-            cx, cy = x + self.cell_size // 2, y + self.cell_size // 2
-            radius = self.cell_size // 3
+            self._draw_ball(*self.game.ball_pos)
+        
+        if not self.animating:
+            self.update_info()
+    
+    def _scroll_region(self):
+        """Scroll region string as Tk reports it for the current map and zoom"""
+        return f"0 0 {self.game.cols * self.cell_size} {self.game.rows * self.cell_size}"
+    
+    def _cell_tag(self, r, c):
+        """Canvas tag shared by all items drawn for cell (r, c)"""
+        return f"cell_{r}_{c}"
+    
+    def _draw_cell(self, r, c, cell=None):
+        """Draw the gem, mine or stop in a single cell (cell overrides the board)"""
+        if cell is None:
+            cell = self.game.board[r][c]
+        x = c * self.cell_size
+        y = r * self.cell_size
+        cx, cy = x + self.cell_size // 2, y + self.cell_size // 2
+        tag = self._cell_tag(r, c)
+        
+        if cell == GEM:
+            # Enhanced gem with glow effect
+            size = self.cell_size // 3
+            # Glow
+            self.canvas.create_oval(
+                cx - size - 3, cy - size - 3,
+                cx + size + 3, cy + size + 3,
+                fill="#80d4ff", outline="", tags=tag
+            )
+            # Diamond shape
+            self.canvas.create_polygon(
+                cx, cy - size,
+                cx + size, cy,
+                cx, cy + size,
+                cx - size, cy,
+                fill="#00aaff", outline="#0088cc", width=2, tags=tag
+            )
+            # Highlight
+            self.canvas.create_polygon(
+                cx, cy - size,
+                cx + size//2, cy - size//2,
+                cx, cy,
+                cx - size//2, cy - size//2,
+                fill="#66ccff", outline="", tags=tag
+            )
             
-            # Shadow
+        elif cell == MINE:
+            # Enhanced mine with danger symbol
+            margin = self.cell_size // 5
+            # Red circle background
             self.canvas.create_oval(
-                cx - radius + 2, cy - radius + 2,
-                cx + radius + 2, cy + radius + 2,
-                fill="#b0b0b0", outline="", tags="ball"
+                cx - margin * 1.5, cy - margin * 1.5,
+                cx + margin * 1.5, cy + margin * 1.5,
+                fill="#ff3333", outline="#cc0000", width=2, tags=tag
+            )
+            # X mark
+            m = margin
+            self.canvas.create_line(
+                cx - m, cy - m, cx + m, cy + m,
+                fill="white", width=3, tags=tag
             )
-            # Main ball
+            self.canvas.create_line(
+                cx + m, cy - m, cx - m, cy + m,
+                fill="white", width=3, tags=tag
+            )
+            
+        elif cell == STOP:
+            # Enhanced stop sign
+            radius = self.cell_size // 3
             self.canvas.create_oval(
                 cx - radius, cy - radius,
                 cx + radius, cy + radius,
-                fill="#2a2a2a", outline="#000000", width=2, tags="ball"
+                fill="#ff6b6b", outline="#cc0000", width=3, tags=tag
+            )
+            self.canvas.create_rectangle(
+                cx - radius * 0.6, cy - radius * 0.15,
+                cx + radius * 0.6, cy + radius * 0.15,
+                fill="white", outline="", tags=tag
             )
-            # Highlight for 3D effect
+    
+    def _draw_ball(self, r, c):
+        """Draw the ball in cell (r, c), replacing any previous ball"""
+        self.canvas.delete("ball")
+        
+        x = c * self.cell_size
+        y = r * self.cell_size
+        cx, cy = x + self.cell_size // 2, y + self.cell_size // 2
+        radius = max(self.cell_size // 3, 2)
+        
+        if self.cell_size < DETAIL_CELL_SIZE:
             self.canvas.create_oval(
-                cx - radius * 0.6, cy - radius * 0.6,
-                cx - radius * 0.2, cy - radius * 0.2,
-                fill="#5a5a5a", outline="", tags="ball"
+                cx - radius, cy - radius,
+                cx + radius, cy + radius,
+                fill="#2a2a2a", outline="", tags="ball"
             )
+            return
         
+        # Shadow
+        self.canvas.create_oval(
+            cx - radius + 2, cy - radius + 2,
+            cx + radius + 2, cy + radius + 2,
+            fill="#b0b0b0", outline="", tags="ball"
+        )
+        # Main ball
+        self.canvas.create_oval(
+            cx - radius, cy - radius,
+            cx + radius, cy + radius,
+            fill="#2a2a2a", outline="#000000", width=2, tags="ball"
+        )
+        # Highlight for 3D effect
+        self.canvas.create_oval(
+            cx - radius * 0.6, cy - radius * 0.6,
+            cx - radius * 0.2, cy - radius * 0.2,
+            fill="#5a5a5a", outline="", tags="ball"
+        )
+    
+    def _on_game_event(self, event):
+        """Queue board changes until the current animation has finished"""
+        if isinstance(event, GameReset):
+            self.pending_events.clear()
+        else:
+            self.pending_events.append(event)
+    
+    def apply_events(self):
+        """Update only what the queued game events changed"""
+        for event in self.pending_events:
+            if isinstance(event, GemCollected):
+                self.canvas.delete(self._cell_tag(*event.pos))
+        self.pending_events.clear()
+        self._draw_ball(*self.game.ball_pos)
         self.update_info()
     
     def update_info(self):
@@ -842,32 +1570,11 @@ class InertiaGUI:
             return
         
         r, c = path[index]
-        x = c * self.cell_size
-        y = r * self.cell_size
-        cx, cy = x + self.cell_size // 2, y + self.cell_size // 2
         
-        self.canvas.delete("ball")
-        
-        radius = self.cell_size // 3
-        
-        # Shadow
-        self.canvas.create_oval(
-            cx - radius + 2, cy - radius + 2,
-            cx + radius + 2, cy + radius + 2,
-            fill="#b0b0b0", outline="", tags="ball"
-        )
-        # Main ball
-        self.canvas.create_oval(
-            cx - radius, cy - radius,
-            cx + radius, cy + radius,
-            fill="#2a2a2a", outline="#000000", width=2, tags="ball"
-        )
-        # Highlight
-        self.canvas.create_oval(
-            cx - radius * 0.6, cy - radius * 0.6,
-            cx - radius * 0.2, cy - radius * 0.2,
-            fill="#5a5a5a", outline="", tags="ball"
-        )
+        # Follow the ball when it slides out of the viewport
+        if self._keep_in_view(r, c):
+            self.draw_board()
+        self._draw_ball(r, c)
         
         self.root.after(80, lambda: self._animate_step(path, index + 1, callback))
     
@@ -890,7 +1597,7 @@ class InertiaGUI:
     
     def cpu_move(self):
         """Handle CPU move"""
-        self.draw_board()
+        self.apply_events()
         
         if self.game.game_over:
             self.show_game_over()
@@ -912,7 +1619,7 @@ class InertiaGUI:
         if hit_mine:
             # CPU hit a mine - you win!
             def after_cpu_mine():
-                self.draw_board()
+                self.apply_events()
                 self.waiting_for_cpu = False
                 self.show_mine_hit("cpu")
             
@@ -920,7 +1627,7 @@ class InertiaGUI:
             return
         
         def after_cpu_move():
-            self.draw_board()
+            self.apply_events()
             self.waiting_for_cpu = False
             if self.game.game_over:
                 self.show_game_over()
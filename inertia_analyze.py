@@ -0,0 +1,326 @@
+# INERTIA - map difficulty analyzer
+"""
+Compute difficulty metrics for every map and write them as a JSON report.
+
+    python inertia_analyze.py                      # all built-in maps
+    python inertia_analyze.py --map-file maps.json -o report.json
+
+A map file is a JSON object of map name -> map dict, in the same format
+as MAPS. Maps are analyzed in parallel, one map per worker process.
+
+Per map the report contains:
+- reachable rest cells, dead ends and forced-mine cells
+- minimum number of moves to clear all gems
+- number of reachable (position, remaining gems) states
+
+The state search stops after --state-budget states; past it the state
+counts are null, as is the clear count unless a clear was already found.
+- for each built-in strategy, the fraction of reachable states where it
+  picks a mine or gets stuck although a safe move exists
+- the first player's gem margin under optimal play by both sides
+- the map's symmetries and how many reachable states remain once
+  symmetric states are merged
+
+Reports are cached on disk per map, keyed by the map contents, the analysis
+parameters and a hash of the engine and analyzer source, so any code change
+invalidates them. Pass --no-cache to always recompute.
+"""
+import argparse
+import hashlib
+import json
+import random
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import inertia
+from inertia_cache import default_cache
+from inertia import MAPS, ALL_DIRECTIONS, InertiaGame, EMPTY, canonical_state
+
+
+# States explored by the (position, remaining gems) BFS before giving up
+DEFAULT_STATE_BUDGET = 1_000_000
+
+_analysis_version = None
+
+
+def analysis_version():
+    """Short hash of the engine and analyzer source the results depend on"""
+    global _analysis_version
+    if _analysis_version is None:
+        digest = hashlib.sha256()
+        for path in (inertia.__file__, __file__):
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        _analysis_version = digest.hexdigest()[:16]
+    return _analysis_version
+
+
+def strategy_names():
+    """Names of all built-in AI strategies"""
+    prefix = "_ai_strategy_"
+    return [name[len(prefix):] for name in dir(InertiaGame) if name.startswith(prefix)]
+
+
+def register_map(map_name, map_data):
+    """Add or replace a map so InertiaGame can load it"""
+    MAPS[map_name] = map_data
+    inertia._layouts.pop(map_name, None)
+
+
+def load_map_file(path):
+    """Read maps from a JSON file, turning coordinate lists into tuples"""
+    with open(path) as f:
+        raw = json.load(f)
+    maps = {}
+    for map_name, data in raw.items():
+        maps[map_name] = {
+            "rows": data["rows"],
+            "cols": data["cols"],
+            "start": tuple(data["start"]),
+            "gems": [tuple(p) for p in data["gems"]],
+            "mines": [tuple(p) for p in data["mines"]],
+            "stops": [tuple(p) for p in data["stops"]]
+        }
+    return maps
+
+
+class MapAnalysis:
+    """Slide transitions of one map over (position, remaining gem mask) states"""
+
+    def __init__(self, map_name):
+        # The slide game keeps every gem; the strategy game gets loaded states
+        self.slides = InertiaGame(map_name)
+        self.game = InertiaGame(map_name)
+        layout = inertia.get_layout(map_name)
+        self.start = layout.start
+        self.symmetries = layout.symmetries
+        gems = [(r, c) for r in range(layout.rows) for c in range(layout.cols)
+                if self.slides.board[r][c] == inertia.GEM]
+        self.gem_bit = {gem: 1 << i for i, gem in enumerate(gems)}
+        self.gems = gems
+        self.full_mask = (1 << len(gems)) - 1
+        self._moves = {}
+
+    def moves(self, pos):
+        """
+        Slides from pos, ignoring gems (they never stop the ball).
+        Returns: (safe, mine) - safe is a list of (direction, end_pos, gem_mask),
+        mine is the list of directions that hit a mine
+        """
+        moves = self._moves.get(pos)
+        if moves is None:
+            safe, mine = [], []
+            for direction in ALL_DIRECTIONS:
+                result = self.slides.slide(direction, pos)
+                if result.hit_mine:
+                    mine.append(direction)
+                elif result.steps > 0:
+                    mask = 0
+                    for cell in result.gem_cells:
+                        mask |= self.gem_bit[cell]
+                    safe.append((direction, result.end_pos, mask))
+            moves = self._moves[pos] = (safe, mine)
+        return moves
+
+    def rest_cells(self):
+        """Positions reachable from the start without hitting a mine"""
+        seen = {self.start}
+        queue = deque([self.start])
+        while queue:
+            pos = queue.popleft()
+            for _, end_pos, _ in self.moves(pos)[0]:
+                if end_pos not in seen:
+                    seen.add(end_pos)
+                    queue.append(end_pos)
+        return seen
+
+    def state_graph(self, budget=None):
+        """
+        BFS over (position, remaining gems) from the start, stopping once
+        more than budget states have been found.
+        Returns: (depth of every state found, min moves to clear or None,
+        whether the whole graph was explored)
+        """
+        start = (self.start, self.full_mask)
+        depth = {start: 0}
+        queue = deque([start])
+        clear_moves = None
+        while queue:
+            if budget is not None and len(depth) > budget:
+                return depth, clear_moves, False
+            state = queue.popleft()
+            pos, mask = state
+            if mask == 0:
+                if clear_moves is None:
+                    clear_moves = depth[state]
+                continue
+            for _, end_pos, gem_mask in self.moves(pos)[0]:
+                nxt = (end_pos, mask & ~gem_mask)
+                if nxt not in depth:
+                    depth[nxt] = depth[state] + 1
+                    queue.append(nxt)
+        return depth, clear_moves, True
+
+    def first_player_margin(self, horizon):
+        """
+        Gem margin of the first mover with optimal play by both sides,
+        looking at most horizon plies ahead. A player with no safe move
+        forfeits the remaining gems to the opponent.
+        """
+        # Transposition table keyed by symmetry-canonical state
+        table = {}
+
+        def negamax(pos, mask, plies):
+            if mask == 0 or plies == 0:
+                return 0
+            key = (self.canonical(pos, mask), plies)
+            if key in table:
+                return table[key]
+            safe = self.moves(pos)[0]
+            if not safe:
+                best = -bin(mask).count("1")
+            else:
+                best = None
+                for _, end_pos, gem_mask in safe:
+                    taken = mask & gem_mask
+                    value = bin(taken).count("1") - negamax(end_pos, mask & ~taken, plies - 1)
+                    if best is None or value > best:
+                        best = value
+            table[key] = best
+            return best
+
+        return negamax(self.start, self.full_mask, horizon)
+
+    def canonical(self, pos, mask):
+        """Symmetry-canonical key of a (position, gem mask) state"""
+        cells = [gem for i, gem in enumerate(self.gems) if mask >> i & 1]
+        return canonical_state(self.symmetries, pos, cells)[0]
+
+    def board_for(self, mask):
+        """Board with only the gems in mask left"""
+        board = [row[:] for row in self.slides.board]
+        for (r, c), bit in self.gem_bit.items():
+            if not mask & bit:
+                board[r][c] = EMPTY
+        return board
+
+    def strategy_errors(self, states):
+        """Fraction of states where each strategy hits a mine or gets stuck"""
+        errors = {}
+        for name in strategy_names():
+            strategy = getattr(InertiaGame, "_ai_strategy_" + name)
+            blunders = stuck = 0
+            for pos, mask in states:
+                self.game.set_state(self.board_for(mask), pos)
+                direction, _ = strategy(self.game)
+                safe, mine = self.moves(pos)
+                if direction in mine:
+                    blunders += 1
+                elif direction is None and safe:
+                    stuck += 1
+            total = max(len(states), 1)
+            errors[name] = {"mine": blunders / total, "stuck": stuck / total}
+        return errors
+
+
+def analyze_map(map_name, map_data, max_states=500, horizon=10, seed=0, use_cache=True,
+                state_budget=DEFAULT_STATE_BUDGET):
+    """Report entry for one map, cached on disk (runs in a worker process)"""
+    def build():
+        return _analyze_map(map_name, map_data, max_states, horizon, seed, state_budget)
+
+    if not use_cache:
+        return map_name, build()
+    kind = f"analysis-{analysis_version()}-s{max_states}-h{horizon}-r{seed}-b{state_budget}"
+    return map_name, default_cache().get_or_build(kind, map_data, build)
+
+
+def _analyze_map(map_name, map_data, max_states, horizon, seed, state_budget):
+    register_map(map_name, map_data)
+    analysis = MapAnalysis(map_name)
+
+    rest = analysis.rest_cells()
+    dead_ends = sorted(pos for pos in rest if not analysis.moves(pos)[0])
+    forced_mine = [pos for pos in dead_ends if analysis.moves(pos)[1]]
+
+    # Past the budget, strategy errors are sampled from the states found so far.
+    # BFS meets the shallowest clear state first, so a clear found is exact
+    depth, clear_moves, complete = analysis.state_graph(state_budget)
+    states = sorted(state for state in depth if state[1])
+    if len(states) > max_states:
+        states = sorted(random.Random(seed).sample(states, max_states))
+
+    return {
+        "rows": map_data["rows"],
+        "cols": map_data["cols"],
+        "gems": len(map_data["gems"]),
+        "reachable_rest_cells": len(rest),
+        "reachable_states": len(depth) if complete else None,
+        "state_graph_complete": complete,
+        "dead_ends": [list(pos) for pos in dead_ends],
+        "forced_mine": [list(pos) for pos in forced_mine],
+        "min_moves_to_clear": clear_moves,
+        "strategy_errors": analysis.strategy_errors(states),
+        "strategy_states_sampled": len(states),
+        "first_player_margin": analysis.first_player_margin(horizon),
+        "margin_horizon": horizon,
+        "symmetries": [symmetry.name for symmetry in analysis.symmetries],
+        "reachable_state_classes": (
+            len({analysis.canonical(*state) for state in depth}) if complete else None
+        )
+    }
+
+
+def analyze(maps, workers=None, max_states=500, horizon=10, use_cache=True,
+            state_budget=DEFAULT_STATE_BUDGET):
+    """Analyze maps in parallel. Returns: dict of map name -> metrics"""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(analyze_map, name, data, max_states, horizon, 0, use_cache,
+                            state_budget)
+            for name, data in maps.items()
+        ]
+        results = dict(future.result() for future in futures)
+    return {name: results[name] for name in maps}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze Inertia map difficulty")
+    parser.add_argument("--map-file", help="JSON file of maps (default: built-in MAPS)")
+    parser.add_argument("--map", action="append", dest="maps",
+                        help="only analyze this map (repeatable)")
+    parser.add_argument("-o", "--output", help="write report here (default: stdout)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per core)")
+    parser.add_argument("--max-states", type=int, default=500,
+                        help="states sampled per map for strategy errors")
+    parser.add_argument("--horizon", type=int, default=10,
+                        help="plies searched for first-player margin")
+    parser.add_argument("--state-budget", type=int, default=DEFAULT_STATE_BUDGET,
+                        help="max (position, gems) states explored per map; past it, "
+                             "min moves and reachable states are reported as null")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="recompute every map instead of reading cached results")
+    args = parser.parse_args()
+
+    maps = load_map_file(args.map_file) if args.map_file else dict(MAPS)
+    if args.maps:
+        unknown = [name for name in args.maps if name not in maps]
+        if unknown:
+            parser.error(f"unknown map: {', '.join(unknown)}")
+        maps = {name: maps[name] for name in args.maps}
+
+    report = {"maps": analyze(maps, args.workers, args.max_states, args.horizon,
+                                   use_cache=not args.no_cache,
+                                   state_budget=args.state_budget)}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# INERTIA - on-disk cache of per-map precomputation
+"""
+Derived per-map structures (slide tables, line indices, solver results)
+are keyed by a content hash of the map dict and pickled to a local cache
+directory, so new processes load them instead of recomputing them.
+
+The cache lives in an "inertia" subdirectory of $INERTIA_CACHE_DIR, or of
+~/.cache by default; set INERTIA_CACHE_DIR to an empty string to disable
+the cache. Entries live in a subdirectory per CACHE_VERSION and the least
+recently used files are evicted once the cache grows past its size limit.
+Nothing outside the "inertia" subdirectory is ever touched.
+"""
+import hashlib
+import json
+import os
+import pickle
+import re
+import shutil
+import tempfile
+
+# Bump whenever the layout of any cached structure changes
+CACHE_VERSION = 4
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Subdirectory owned by the cache inside the configured directory
+CACHE_SUBDIR = "inertia"
+_VERSION_DIR = re.compile(r"v\d+")
+
+
+def map_key(map_data):
+    """Content hash of a map dict (rows, cols, start, gems, mines, stops)"""
+    canonical = {
+        "rows": map_data["rows"],
+        "cols": map_data["cols"],
+        "start": list(map_data["start"]),
+        "gems": sorted(list(p) for p in map_data["gems"]),
+        "mines": sorted(list(p) for p in map_data["mines"]),
+        "stops": sorted(list(p) for p in map_data["stops"])
+    }
+    text = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def default_cache_dir():
+    """Parent of the cache directory, from the environment (None if disabled)"""
+    directory = os.environ.get("INERTIA_CACHE_DIR")
+    if directory is None:
+        directory = os.path.join(os.path.expanduser("~"), ".cache")
+    return directory or None
+
+
+class DiskCache:
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        """directory: parent directory; the cache only writes to its CACHE_SUBDIR"""
+        self.root = os.path.join(directory, CACHE_SUBDIR) if directory else None
+        self.max_bytes = max_bytes
+        self.directory = os.path.join(self.root, f"v{CACHE_VERSION}") if directory else None
+
+    def _path(self, kind, map_data):
+        return os.path.join(self.directory, f"{kind}-{map_key(map_data)}.pickle")
+
+    def get(self, kind, map_data, default=None):
+        """Load a cached value, or default if missing or unreadable"""
+        if self.directory is None:
+            return default
+        path = self._path(kind, map_data)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            os.utime(path)  # Mark as recently used
+            return value
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return default
+
+    def put(self, kind, map_data, value):
+        """Store a value; failures only cost a recomputation later"""
+        if self.directory is None:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a temp file first so readers never see partial entries
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(kind, map_data))
+        except OSError:
+            return
+        self.evict()
+
+    def get_or_build(self, kind, map_data, build):
+        """Load a cached value, building and storing it if missing"""
+        missing = object()
+        value = self.get(kind, map_data, missing)
+        if value is missing:
+            value = build()
+            self.put(kind, map_data, value)
+        return value
+
+    def evict(self):
+        """Drop old cache versions and least recently used entries over the size limit"""
+        try:
+            for name in os.listdir(self.root):
+                path = os.path.join(self.root, name)
+                if (_VERSION_DIR.fullmatch(name) and path != self.directory
+                        and os.path.isdir(path) and not os.path.islink(path)):
+                    shutil.rmtree(path, ignore_errors=True)
+
+            entries = []
+            total = 0
+            for entry in os.scandir(self.directory):
+                if entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                os.remove(path)
+                total -= size
+        except OSError:
+            pass
+
+
+_default_cache = None
+
+
+def default_cache():
+    """Process-wide cache in the default directory"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = DiskCache(default_cache_dir())
+    return _default_cache
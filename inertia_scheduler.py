@@ -0,0 +1,124 @@
+# INERTIA - latency-aware CPU move scheduler
+"""
+Pick the strongest CPU configuration that answers within a per-move
+latency target.
+
+Configurations are ordered from cheapest to strongest: the greedy
+strategy, the map's own strategy, then the lookahead search of
+inertia_search at increasing depths. Every decision is timed and the cost
+of each (map, configuration) pair is tracked as a moving average plus a
+deviation margin, so the choice adapts to the machine it runs on without
+per-map tuning. A configuration that has never run is only tried when the
+next cheaper one is fast enough to leave room for GROWTH times its cost.
+The estimate of the first configuration found too slow decays on every
+decision, so one cold or unlucky sample does not rule it out for good: it
+is probed again once its estimate drops back under the target.
+
+Each search starts from an empty transposition table, so its cost depends
+on the position only and not on what earlier decisions left in the table.
+
+    scheduler = DeadlineScheduler(target=0.05)
+    direction, path = scheduler.choose(game)
+"""
+import time
+
+from inertia import InertiaGame
+from inertia_search import MapMoves
+
+# Assumed cost ratio between a configuration and the next cheaper one
+GROWTH = 8.0
+
+
+class DeadlineScheduler:
+    def __init__(self, target=0.05, depths=(2, 3, 4, 5, 6), alpha=0.2, deviations=2.0,
+                 decay=0.95):
+        """
+        target: latency target per move, in seconds
+        depths: lookahead search depths to consider
+        alpha: weight of the newest sample in the moving averages
+        deviations: safety margin, in mean absolute deviations
+        decay: per-decision ageing of the estimate of a configuration
+            skipped as too slow
+        """
+        self.target = target
+        self.depths = tuple(depths)
+        self.alpha = alpha
+        self.deviations = deviations
+        self.decay = decay
+        # (map name, configuration name) -> [mean, mean absolute deviation]
+        self.costs = {}
+        self.last_config = None
+        self._moves = {}
+
+    def configs(self, map_name):
+        """(name, function(game) -> (direction, path)) from cheapest to strongest"""
+        greedy = InertiaGame._ai_strategy_greedy
+        strategy = InertiaGame.ai_strategies.get(map_name, greedy)
+        configs = [("greedy", greedy)]
+        if strategy is not greedy:
+            configs.append((strategy.__name__[len("_ai_strategy_"):], strategy))
+        for depth in self.depths:
+            configs.append((f"search-{depth}", self._search(depth)))
+        return configs
+
+    def _search(self, depth):
+        def search(game):
+            moves = self._moves[game.map_name]
+            moves.table.clear()
+            direction = moves.best_move(game.ball_pos, moves.state_mask(game.board), depth)
+            if direction is None:
+                return None, []
+            return direction, game.slide(direction).path
+        return search
+
+    def estimate(self, map_name, name):
+        """Expected worst-case seconds for a configuration, None if unmeasured"""
+        cost = self.costs.get((map_name, name))
+        if cost is None:
+            return None
+        mean, deviation = cost
+        return mean + self.deviations * deviation
+
+    def record(self, map_name, name, seconds):
+        """Fold one measured decision time into the estimates"""
+        cost = self.costs.get((map_name, name))
+        if cost is None:
+            self.costs[(map_name, name)] = [seconds, 0.0]
+            return
+        mean, deviation = cost
+        error = seconds - mean
+        cost[0] = mean + self.alpha * error
+        cost[1] = deviation + self.alpha * (abs(error) - deviation)
+
+    def select(self, map_name):
+        """Strongest configuration expected to fit the target"""
+        configs = self.configs(map_name)
+        chosen = configs[0]
+        for cheaper, config in zip(configs, configs[1:]):
+            estimate = self.estimate(map_name, config[0])
+            if estimate is None:
+                # Probe one step up only when there is room for it
+                cheaper_estimate = self.estimate(map_name, cheaper[0])
+                if cheaper_estimate is not None and cheaper_estimate * GROWTH <= self.target:
+                    chosen = config
+                break
+            if estimate > self.target:
+                # Age the estimate so this configuration gets probed again
+                cost = self.costs[(map_name, config[0])]
+                cost[0] *= self.decay
+                cost[1] *= self.decay
+                break
+            chosen = config
+        return chosen
+
+    def choose(self, game):
+        """Pick and time the CPU move for game. Returns: (direction, path)"""
+        name, func = self.select(game.map_name)
+        if name.startswith("search-") and game.map_name not in self._moves:
+            # One-off table build, kept out of the timed decision
+            self._moves[game.map_name] = MapMoves(game.map_name)
+        start = time.perf_counter()
+        result = func(game)
+        self.record(game.map_name, name, time.perf_counter() - start)
+        self.last_config = name
+        return result
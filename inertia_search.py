@@ -0,0 +1,179 @@
+# INERTIA - root-parallel lookahead search
+"""
+Root-parallel CPU search for the large expert maps.
+
+The 8 root moves of a position are independent, so each one is searched
+in its own task on a persistent process pool. Workers receive the board
+templates once at startup (through shared memory) and build their slide
+tables locally; each request only carries a compact state key
+(map name, ball position, bitmask of remaining gems). Results are merged
+by score, ties going to the earlier direction in ALL_DIRECTIONS.
+
+    search = RootParallelSearch(["Map 7 - Expert Grid"], depth=6)
+    direction, path = search.choose(game)
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+from inertia import (
+    ALL_DIRECTIONS, GEM,
+    get_layout, share_templates, attach_templates, canonical_state
+)
+
+# Maps where the root-parallel search is worth its overhead
+ROOT_PARALLEL_MAPS = ["Map 7 - Expert Grid", "Map 8 - Master Challenge"]
+
+# Transposition tables are dropped once they grow past this many entries
+MAX_TABLE_SIZE = 1_000_000
+
+
+class MapMoves:
+    """Static slide outcomes of one map as gem bitmasks"""
+
+    def __init__(self, map_name):
+        layout = get_layout(map_name)
+        self.layout = layout
+        self.gems = [
+            (r, c) for r in range(layout.rows) for c in range(layout.cols)
+            if layout.template[r * layout.cols + c] == GEM
+        ]
+        gem_bit = {gem: 1 << i for i, gem in enumerate(self.gems)}
+        self.gem_bit = gem_bit
+
+        # (pos, direction) -> (end_pos, gem mask of the cells passed over),
+        # for moves that neither hit a mine nor stay in place
+        self.moves = {}
+        for (pos, direction), slide in layout.all_slides().items():
+            end_pos, steps, hit_mine, _, (family, lo, hi, _) = slide
+            if hit_mine or steps == 0:
+                continue
+            mask = 0
+            for cell in layout.line_cells[family][lo:hi + 1]:
+                mask |= gem_bit.get(cell, 0)
+            self.moves[(pos, direction)] = (end_pos, mask)
+        self.table = {}
+
+    def state_mask(self, board):
+        """Bitmask of the gems still on a board"""
+        mask = 0
+        for i, (r, c) in enumerate(self.gems):
+            if board[r][c] == GEM:
+                mask |= 1 << i
+        return mask
+
+    def search(self, pos, mask, depth):
+        """
+        Best discounted gem haul reachable in depth moves, gems taken on
+        earlier moves weighing more. Memoized per symmetry class.
+        """
+        if depth == 0 or mask == 0:
+            return 0
+        cells = [gem for i, gem in enumerate(self.gems) if mask >> i & 1]
+        key = (canonical_state(self.layout.symmetries, pos, cells)[0], depth)
+        value = self.table.get(key)
+        if value is not None:
+            return value
+
+        value = 0
+        for direction in ALL_DIRECTIONS:
+            move = self.moves.get((pos, direction))
+            if move is None:
+                continue
+            end_pos, gem_mask = move
+            taken = mask & gem_mask
+            score = bin(taken).count("1") * depth + self.search(end_pos, mask & ~taken, depth - 1)
+            if score > value:
+                value = score
+
+        if len(self.table) >= MAX_TABLE_SIZE:
+            self.table.clear()
+        self.table[key] = value
+        return value
+
+    def score_root(self, pos, mask, direction, depth):
+        """Score of playing direction first, None if it is not a legal move"""
+        move = self.moves.get((pos, direction))
+        if move is None:
+            return None
+        end_pos, gem_mask = move
+        taken = mask & gem_mask
+        return bin(taken).count("1") * depth + self.search(end_pos, mask & ~taken, depth - 1)
+
+    def best_move(self, pos, mask, depth):
+        """Serial search of all root moves. Returns: direction or None"""
+        best_direction = None
+        best_score = -1
+        for direction in ALL_DIRECTIONS:
+            score = self.score_root(pos, mask, direction, depth)
+            if score is not None and score > best_score:
+                best_direction = direction
+                best_score = score
+        return best_direction
+
+
+# Per-worker map data, built once by the pool initializer
+_worker_maps = {}
+
+
+def _init_worker(shm_name, index):
+    attach_templates(shm_name, index)
+    for map_name in index:
+        _worker_maps[map_name] = MapMoves(map_name)
+
+
+def _search_root(map_name, pos, mask, direction, depth):
+    """Score one root move (runs in a worker process). None if illegal"""
+    return _worker_maps[map_name].score_root(pos, mask, direction, depth)
+
+
+class RootParallelSearch:
+    def __init__(self, map_names=None, workers=None, depth=6):
+        self.depth = depth
+        self.map_names = list(map_names or ROOT_PARALLEL_MAPS)
+        self.maps = {name: MapMoves(name) for name in self.map_names}
+        self.templates_shm, index = share_templates(self.map_names)
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.templates_shm.name, index)
+        )
+
+    def _submit(self, game):
+        """Queue one task per root move. Returns: list of (direction, future)"""
+        moves = self.maps[game.map_name]
+        mask = moves.state_mask(game.board)
+        return [
+            (direction, self.executor.submit(
+                _search_root, game.map_name, game.ball_pos, mask, direction, self.depth
+            ))
+            for direction in ALL_DIRECTIONS
+            if (game.ball_pos, direction) in moves.moves
+        ]
+
+    def _merge(self, game, scored):
+        """Best (direction, path) from (direction, score) pairs"""
+        best_direction = None
+        best_score = -1
+        for direction, score in scored:
+            if score is not None and score > best_score:
+                best_direction = direction
+                best_score = score
+        if best_direction is None:
+            return None, []
+        return best_direction, game.slide(best_direction).path
+
+    def choose(self, game):
+        """Pick the CPU move for game, blocking until all roots are searched"""
+        tasks = self._submit(game)
+        return self._merge(game, [(d, future.result()) for d, future in tasks])
+
+    async def choose_async(self, game):
+        """Like choose, without blocking the event loop"""
+        tasks = self._submit(game)
+        scores = await asyncio.gather(*(asyncio.wrap_future(f) for _, f in tasks))
+        return self._merge(game, zip((d for d, _ in tasks), scores))
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+        self.templates_shm.close()
+        self.templates_shm.unlink()
@@ -0,0 +1,290 @@
+# INERTIA - headless match server
+"""
+Headless asyncio server hosting many concurrent InertiaGame matches.
+
+Clients speak a line-based protocol over TCP or a Unix socket. Every request
+is one line of text and every reply is one line of JSON:
+
+    NEW [map name]          start a match (random map if omitted)
+    MOVE <game> <dir>       human move, dir is up/down/left/right/
+                            up_left/up_right/down_left/down_right
+    CPU <game>              let the CPU pick and play its move
+    STATE <game>            query the current state of a match
+    END <game>              close a match
+    MAPS                    list available maps
+
+Requests on one connection are answered in order. To multiplex several
+matches over one connection, prefix a request with "@<id> "; tagged requests
+run concurrently, their replies may arrive out of order and carry the same
+"id". Commands on one match are always applied in the order received.
+
+CPU decisions run in a process pool so a slow search on one match never
+stalls the event loop serving the others. With --root-parallel, the expert
+maps use a root-parallel lookahead search spread over its own pool. With
+--latency-ms, each worker picks the strongest strategy or search depth
+that fits the per-move latency target on its own machine.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from inertia_search import RootParallelSearch
+from inertia_scheduler import DeadlineScheduler
+from inertia import (
+    MAPS, InertiaGame, share_templates, attach_templates,
+    UP, DOWN, LEFT, RIGHT, UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT
+)
+
+DIRECTION_NAMES = {
+    "up": UP,
+    "down": DOWN,
+    "left": LEFT,
+    "right": RIGHT,
+    "up_left": UP_LEFT,
+    "up_right": UP_RIGHT,
+    "down_left": DOWN_LEFT,
+    "down_right": DOWN_RIGHT
+}
+DIRECTION_LABELS = {direction: name for name, direction in DIRECTION_NAMES.items()}
+
+# Per-process game objects reused by pool workers, one per map
+_worker_games = {}
+# Per-process scheduler, so decision costs are measured on the worker's machine
+_worker_scheduler = None
+
+
+def _cpu_decision(map_name, board, ball_pos, latency=None):
+    """Pick the CPU move for a board snapshot (runs in a worker process)"""
+    global _worker_scheduler
+    game = _worker_games.get(map_name)
+    if game is None:
+        game = _worker_games[map_name] = InertiaGame(map_name, flat_board=True)
+    game.set_state(board, ball_pos)
+    if latency is None:
+        direction, _ = game.get_cpu_move()
+    else:
+        if _worker_scheduler is None or _worker_scheduler.target != latency:
+            _worker_scheduler = DeadlineScheduler(target=latency)
+        direction, _ = _worker_scheduler.choose(game)
+    return direction
+
+
+class Match:
+    """A hosted game plus the lock serialising commands against it"""
+
+    def __init__(self, game_id, map_name):
+        self.game_id = game_id
+        self.game = InertiaGame(map_name, flat_board=True)
+        self.lock = asyncio.Lock()
+
+    def state(self):
+        """Snapshot of the match as plain JSON-friendly data"""
+        game = self.game
+        return {
+            "game": self.game_id,
+            "map": game.map_name,
+            "rows": game.rows,
+            "cols": game.cols,
+            "board": [list(row) for row in game.board],
+            "ball": list(game.ball_pos),
+            "human_score": game.human_score,
+            "cpu_score": game.cpu_score,
+            "human_moves": game.human_moves,
+            "cpu_moves": game.cpu_moves,
+            "human_eliminated": game.human_eliminated,
+            "cpu_eliminated": game.cpu_eliminated,
+            "game_over": game.game_over
+        }
+
+
+class InertiaServer:
+    def __init__(self, workers=None, root_parallel=False, latency=None):
+        """latency: per-move CPU latency target in seconds (None: fixed strategies)"""
+        self.matches = {}
+        self.latency = latency
+        self.search = RootParallelSearch(workers=workers) if root_parallel else None
+        # Workers read the board templates from one shared block
+        self.templates_shm, index = share_templates()
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=attach_templates,
+            initargs=(self.templates_shm.name, index)
+        )
+        self._ids = itertools.count(1)
+
+    async def handle_client(self, reader, writer):
+        """Serve one connection until it closes"""
+        pending = set()
+
+        async def respond(line, request_id=None):
+            reply = await self.dispatch(line)
+            if request_id is not None:
+                reply["id"] = request_id
+            writer.write((json.dumps(reply) + "\n").encode("utf-8"))
+            await writer.drain()
+
+        async def respond_tagged(line, request_id):
+            try:
+                await respond(line, request_id)
+            except (ConnectionResetError, BrokenPipeError):
+                pass
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.decode("utf-8", "replace").strip()
+                if not line:
+                    continue
+                if line.startswith("@"):
+                    request_id, _, line = line[1:].partition(" ")
+                    task = asyncio.create_task(respond_tagged(line.strip(), request_id))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+                else:
+                    await respond(line)
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            if pending:
+                await asyncio.gather(*pending)
+            writer.close()
+
+    async def dispatch(self, line):
+        """Parse and execute a single request line; never raises"""
+        command, _, rest = line.partition(" ")
+        command = command.upper()
+        rest = rest.strip()
+        handler = {
+            "NEW": self.cmd_new,
+            "MOVE": self.cmd_move,
+            "CPU": self.cmd_cpu,
+            "STATE": self.cmd_state,
+            "END": self.cmd_end,
+            "MAPS": self.cmd_maps
+        }.get(command)
+        if handler is None:
+            return {"ok": False, "error": f"unknown command: {command}"}
+        try:
+            return await handler(rest)
+        except ValueError as exc:
+            return {"ok": False, "error": str(exc)}
+        except Exception as exc:
+            # e.g. a broken worker pool; report it rather than drop the client
+            return {"ok": False, "error": f"internal error: {type(exc).__name__}: {exc}"}
+
+    def _match(self, arg):
+        """Look up a match by id"""
+        try:
+            game_id = int(arg)
+        except ValueError:
+            raise ValueError(f"invalid game id: {arg!r}")
+        match = self.matches.get(game_id)
+        if match is None:
+            raise ValueError(f"unknown game: {game_id}")
+        return match
+
+    async def cmd_new(self, rest):
+        map_name = rest or random.choice(list(MAPS.keys()))
+        if map_name not in MAPS:
+            raise ValueError(f"unknown map: {map_name}")
+        match = Match(next(self._ids), map_name)
+        self.matches[match.game_id] = match
+        return {"ok": True, "state": match.state()}
+
+    async def cmd_move(self, rest):
+        game_arg, _, dir_arg = rest.partition(" ")
+        match = self._match(game_arg)
+        direction = DIRECTION_NAMES.get(dir_arg.strip().lower())
+        if direction is None:
+            raise ValueError(f"invalid direction: {dir_arg!r}")
+        async with match.lock:
+            success, gems, path, hit_mine = match.game.make_move(direction, is_human=True)
+            return {"ok": True, "success": success, "gems": gems,
+                    "hit_mine": hit_mine, "path": [list(p) for p in path],
+                    "state": match.state()}
+
+    async def cmd_cpu(self, rest):
+        match = self._match(rest)
+        async with match.lock:
+            game = match.game
+            if game.game_over:
+                return {"ok": True, "success": False, "direction": None,
+                        "state": match.state()}
+            if self.search and game.map_name in self.search.maps:
+                direction, _ = await self.search.choose_async(game)
+            else:
+                loop = asyncio.get_running_loop()
+                direction = await loop.run_in_executor(
+                    self.executor, _cpu_decision,
+                    game.map_name, bytes(game.cells), game.ball_pos, self.latency
+                )
+            if direction is None:
+                # CPU is stuck, nothing to play
+                return {"ok": True, "success": False, "direction": None,
+                        "state": match.state()}
+            success, gems, path, hit_mine = game.make_move(direction, is_human=False)
+            return {"ok": True, "success": success,
+                    "direction": DIRECTION_LABELS[direction], "gems": gems,
+                    "hit_mine": hit_mine, "path": [list(p) for p in path],
+                    "state": match.state()}
+
+    async def cmd_state(self, rest):
+        match = self._match(rest)
+        return {"ok": True, "state": match.state()}
+
+    async def cmd_end(self, rest):
+        match = self._match(rest)
+        del self.matches[match.game_id]
+        return {"ok": True, "game": match.game_id}
+
+    async def cmd_maps(self, rest):
+        return {"ok": True, "maps": list(MAPS.keys())}
+
+    async def serve(self, host="127.0.0.1", port=7878, unix_path=None):
+        """Listen for clients until cancelled"""
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle_client, path=unix_path)
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        if self.search:
+            self.search.close()
+        self.executor.shutdown(cancel_futures=True)
+        self.templates_shm.close()
+        self.templates_shm.unlink()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Inertia match server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7878)
+    parser.add_argument("--unix", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="CPU search processes (default: one per core)")
+    parser.add_argument("--root-parallel", action="store_true",
+                        help="search expert-map root moves in parallel")
+    parser.add_argument("--latency-ms", type=float, default=None,
+                        help="per-move CPU latency target; picks strategy and depth to fit")
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000 if args.latency_ms is not None else None
+    server = InertiaServer(workers=args.workers, root_parallel=args.root_parallel,
+                           latency=latency)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
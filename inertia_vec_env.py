@@ -0,0 +1,210 @@
+# INERTIA - batched environment for training
+"""
+Gym-style batched environment over the InertiaGame rules.
+
+Steps N independent single-player games per call, one map per slot (slots
+may mix maps). Finished games are reset automatically. Observations,
+rewards and done flags live in preallocated NumPy arrays that are
+overwritten in place on every step, so keep copies if you need history.
+
+    env = VecInertiaEnv(1024, ["Map 1 - Introduction", "Map 7 - Expert Grid"])
+    obs = env.reset()
+    obs, rewards, dones = env.step(actions)   # actions index ALL_DIRECTIONS
+
+Requires NumPy (the game itself does not).
+"""
+import numpy as np
+
+from inertia import MAPS, ALL_DIRECTIONS, InertiaGame, GEM, MINE, STOP
+
+# Observation planes
+PLANE_GEMS = 0
+PLANE_MINES = 1
+PLANE_STOPS = 2
+PLANE_BALL = 3
+NUM_PLANES = 4
+
+
+class VecInertiaEnv:
+    def __init__(self, num_envs, map_names=None, gem_reward=1.0, mine_reward=-1.0,
+                 max_steps=200):
+        """
+        num_envs: number of parallel games
+        map_names: maps assigned to slots round-robin (default: all MAPS)
+        max_steps: moves before an episode is cut off
+        """
+        map_names = list(map_names or MAPS)
+        self.num_envs = num_envs
+        self.map_names = map_names
+        self.gem_reward = gem_reward
+        self._gem_reward = np.float32(gem_reward)
+        self.mine_reward = mine_reward
+        self.max_steps = max_steps
+        self.num_actions = len(ALL_DIRECTIONS)
+
+        # Every map is padded to the largest board
+        self.height = max(MAPS[name]["rows"] for name in map_names)
+        self.width = max(MAPS[name]["cols"] for name in map_names)
+        self.observation_shape = (NUM_PLANES, self.height, self.width)
+        self._build_tables()
+        self._allocate()
+
+    def _build_tables(self):
+        """Precompute slide outcomes for every map, cell and direction"""
+        cells = self.height * self.width
+        steps = max(self.height, self.width) - 1
+        num_maps = len(self.map_names)
+        actions = self.num_actions
+
+        # Flat index `cells` is a sentinel gem slot that is always empty
+        end = np.zeros((num_maps, cells, actions), dtype=np.intp)
+        mine = np.zeros((num_maps, cells, actions), dtype=bool)
+        path = np.full((num_maps, cells, actions, steps), cells, dtype=np.intp)
+        stuck = np.zeros((num_maps, cells), dtype=bool)
+        self._gem_templates = np.zeros((num_maps, cells + 1), dtype=np.uint8)
+        self._static_planes = np.zeros((num_maps, 2, self.height, self.width), dtype=np.uint8)
+        self._starts = np.zeros(num_maps, dtype=np.intp)
+        self._totals = np.zeros(num_maps, dtype=np.intp)
+
+        for k, map_name in enumerate(self.map_names):
+            game = InertiaGame(map_name)
+            for r in range(game.rows):
+                for c in range(game.cols):
+                    p = r * self.width + c
+                    cell = game.board[r][c]
+                    self._gem_templates[k, p] = cell == GEM
+                    self._static_planes[k, 0, r, c] = cell == MINE
+                    self._static_planes[k, 1, r, c] = cell == STOP
+                    safe = False
+                    for a, direction in enumerate(ALL_DIRECTIONS):
+                        result = game.slide(direction, (r, c))
+                        end_r, end_c = result.end_pos
+                        end[k, p, a] = end_r * self.width + end_c
+                        mine[k, p, a] = result.hit_mine
+                        for i, (pr, pc) in enumerate(result.path[1:]):
+                            path[k, p, a, i] = pr * self.width + pc
+                        safe = safe or (result.steps > 0 and not result.hit_mine)
+                    stuck[k, p] = not safe
+            # Padding cells outside a smaller map never move
+            for p in range(cells):
+                if p // self.width >= game.rows or p % self.width >= game.cols:
+                    end[k, p] = p
+            start_r, start_c = game.initial_pos
+            self._starts[k] = start_r * self.width + start_c
+            self._totals[k] = game.total_gems
+
+        self._end = end.reshape(-1)
+        self._mine = mine.reshape(-1)
+        self._path = path.reshape(-1, steps)
+        self._stuck = stuck.reshape(-1)
+
+    def _allocate(self):
+        """Per-slot state and scratch buffers, reused by every step"""
+        n = self.num_envs
+        cells = self.height * self.width
+        steps = self._path.shape[1]
+
+        self.map_ids = np.arange(n, dtype=np.intp) % len(self.map_names)
+        self.pos = np.zeros(n, dtype=np.intp)
+        self.remaining = np.zeros(n, dtype=np.intp)
+        self.steps = np.zeros(n, dtype=np.intp)
+        self.gems = np.zeros((n, cells + 1), dtype=np.uint8)
+
+        # Per-slot reset values
+        self._slot_gems = self._gem_templates[self.map_ids]
+        self._slot_start = self._starts[self.map_ids]
+        self._slot_total = self._totals[self.map_ids]
+        self._move_base = self.map_ids * cells * self.num_actions
+        self._cell_base = self.map_ids * cells
+        # Full shape rather than broadcast, so adding it needs no ufunc buffer
+        self._gem_base = np.repeat(
+            np.arange(n, dtype=np.intp)[:, None] * (cells + 1), steps, axis=1
+        )
+        self._ball_base = np.arange(n, dtype=np.intp) * NUM_PLANES * cells + PLANE_BALL * cells
+
+        # Outputs, overwritten in place
+        self.obs = np.zeros((n,) + self.observation_shape, dtype=np.uint8)
+        self.rewards = np.zeros(n, dtype=np.float32)
+        self.dones = np.zeros(n, dtype=bool)
+        self.obs[:, PLANE_MINES:PLANE_STOPS + 1] = self._static_planes[self.map_ids]
+        self._obs_gems = self.obs[:, PLANE_GEMS].reshape(n, cells)
+
+        # Scratch
+        self._move = np.zeros(n, dtype=np.intp)
+        self._cell = np.zeros(n, dtype=np.intp)
+        self._ball = self._ball_base.copy()
+        self._hit_mine = np.zeros(n, dtype=bool)
+        self._flags = np.zeros(n, dtype=bool)
+        self._gem_idx = np.zeros((n, steps), dtype=np.intp)
+        self._gem_hits = np.zeros((n, steps), dtype=np.uint8)
+        # Summed in the gem dtype's width first: mixed-dtype reductions allocate
+        self._collected_small = np.zeros(n, dtype=np.uint8 if steps < 255 else np.uint16)
+        self._collected = np.zeros(n, dtype=np.intp)
+
+    def reset(self):
+        """Reset every slot. Returns: observations"""
+        self.dones.fill(True)
+        self._reset_done()
+        self.dones.fill(False)
+        self.rewards.fill(0)
+        self._write_obs()
+        return self.obs
+
+    def step(self, actions):
+        """
+        Play one move in every slot; actions is an integer array indexing
+        ALL_DIRECTIONS (ValueError if any action is out of range).
+        Returns: (obs, rewards, dones) - finished slots are already reset
+        """
+        if actions.min() < 0 or actions.max() >= self.num_actions:
+            raise ValueError(f"actions must be in 0..{self.num_actions - 1}")
+
+        # Row into the slide tables for (map, position, action)
+        np.multiply(self.pos, self.num_actions, out=self._move)
+        np.add(self._move, actions, out=self._move)
+        np.add(self._move, self._move_base, out=self._move)
+
+        # Gems along the slide, looked up in each slot's own gem row
+        # Indices are always in range; mode="clip" lets take write straight into out
+        np.take(self._path, self._move, axis=0, out=self._gem_idx, mode="clip")
+        np.add(self._gem_idx, self._gem_base, out=self._gem_idx)
+        np.take(self.gems, self._gem_idx, out=self._gem_hits, mode="clip")
+        self._gem_hits.sum(axis=1, out=self._collected_small)
+        np.copyto(self._collected, self._collected_small)
+        np.put(self.gems, self._gem_idx, 0)
+
+        np.take(self._mine, self._move, out=self._hit_mine, mode="clip")
+        np.take(self._end, self._move, out=self.pos, mode="clip")
+        np.subtract(self.remaining, self._collected, out=self.remaining)
+        self.steps += 1
+
+        np.copyto(self.rewards, self._collected, casting="unsafe")
+        np.multiply(self.rewards, self._gem_reward, out=self.rewards)
+        np.copyto(self.rewards, self.mine_reward, where=self._hit_mine)
+
+        # Done on mine, all gems gone, no safe move left or out of time
+        np.add(self._cell_base, self.pos, out=self._cell)
+        np.take(self._stuck, self._cell, out=self._flags, mode="clip")
+        np.equal(self.remaining, 0, out=self.dones)
+        np.logical_or(self.dones, self._hit_mine, out=self.dones)
+        np.logical_or(self.dones, self._flags, out=self.dones)
+        np.greater_equal(self.steps, self.max_steps, out=self._flags)
+        np.logical_or(self.dones, self._flags, out=self.dones)
+
+        self._reset_done()
+        self._write_obs()
+        return self.obs, self.rewards, self.dones
+
+    def _reset_done(self):
+        """Restore the initial state of every slot flagged in dones"""
+        np.copyto(self.gems, self._slot_gems, where=self.dones[:, None])
+        np.copyto(self.pos, self._slot_start, where=self.dones)
+        np.copyto(self.remaining, self._slot_total, where=self.dones)
+        np.copyto(self.steps, 0, where=self.dones)
+
+    def _write_obs(self):
+        """Refresh the gem and ball planes from the current state"""
+        np.copyto(self._obs_gems, self.gems[:, :-1])
+        np.put(self.obs, self._ball, 0)
+        np.add(self._ball_base, self.pos, out=self._ball)
+        np.put(self.obs, self._ball, 1)
@@ -0,0 +1,68 @@
+"""DiskCache eviction and configuration"""
+import os
+
+import inertia_cache
+from inertia import MAPS
+from inertia_cache import CACHE_SUBDIR, CACHE_VERSION, DiskCache, default_cache_dir
+
+MAP_DATA = MAPS["Map 1 - Introduction"]
+
+
+def other_map(i):
+    return dict(MAP_DATA, start=(i, 0))
+
+
+def test_only_stale_version_dirs_are_removed(tmp_path):
+    # Siblings of the cache directory, some with version-like names
+    for name in ("venv", "vendor", "videos", "v1", f"v{CACHE_VERSION}"):
+        (tmp_path / name).mkdir()
+    owned = tmp_path / CACHE_SUBDIR
+    for name in ("v1", f"v{CACHE_VERSION + 1}", "v2backup", "vendor", "notes"):
+        (owned / name).mkdir(parents=True)
+    (owned / "v0").write_text("a file, not a version directory")
+
+    cache = DiskCache(str(tmp_path))
+    cache.put("kind", MAP_DATA, 42)
+
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        ["venv", "vendor", "videos", "v1", f"v{CACHE_VERSION}", CACHE_SUBDIR]
+    )
+    assert sorted(os.listdir(owned)) == sorted(
+        ["v0", "v2backup", "vendor", "notes", f"v{CACHE_VERSION}"]
+    )
+    assert cache.get("kind", MAP_DATA) == 42
+
+
+def test_lru_eviction_respects_max_bytes(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    payload = b"x" * 1000
+    for i in range(5):
+        cache.put("kind", other_map(i), payload)
+        # Distinct, increasing use times
+        os.utime(cache._path("kind", other_map(i)), (1000 + i, 1000 + i))
+    entry_size = os.path.getsize(cache._path("kind", other_map(0)))
+
+    # Reading map 0 makes it the most recently used entry
+    cache.get("kind", other_map(0))
+    cache.max_bytes = 3 * entry_size
+    cache.evict()
+
+    kept = [i for i in range(5) if os.path.exists(cache._path("kind", other_map(i)))]
+    assert kept == [0, 3, 4]
+    total = sum(entry.stat().st_size for entry in os.scandir(cache.directory))
+    assert total <= cache.max_bytes
+
+
+def test_empty_env_disables_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("INERTIA_CACHE_DIR", "")
+    assert default_cache_dir() is None
+    monkeypatch.setattr(inertia_cache, "_default_cache", None)
+    cache = inertia_cache.default_cache()
+    cache.put("kind", MAP_DATA, 42)
+    assert cache.get("kind", MAP_DATA, "missing") == "missing"
+    assert cache.get_or_build("kind", MAP_DATA, lambda: 7) == 7
+
+    monkeypatch.setenv("INERTIA_CACHE_DIR", str(tmp_path))
+    assert default_cache_dir() == str(tmp_path)
+    DiskCache(default_cache_dir()).put("kind", MAP_DATA, 42)
+    assert os.listdir(tmp_path) == [CACHE_SUBDIR]
@@ -0,0 +1,133 @@
+"""Fenwick gem index and slide table against a brute-force board walk"""
+import random
+
+import pytest
+
+import inertia
+from inertia import ALL_DIRECTIONS, EMPTY, GEM, MINE, STOP, InertiaGame
+from inertia_cache import DiskCache
+
+
+@pytest.fixture(autouse=True)
+def no_disk_cache(monkeypatch):
+    monkeypatch.setattr(inertia, "default_cache", lambda: DiskCache(None))
+
+
+@pytest.fixture
+def random_map():
+    """Register a random 60x45 map, removing it again afterwards"""
+    rng = random.Random(7)
+    rows, cols = 60, 45
+    cells = [(r, c) for r in range(rows) for c in range(cols)]
+    rng.shuffle(cells)
+    k = len(cells) // 10
+    name = "Test - Random 60x45"
+    inertia.MAPS[name] = {
+        "rows": rows, "cols": cols, "start": cells[0],
+        "gems": cells[1:3 * k], "mines": cells[3 * k:3 * k + k // 4],
+        "stops": cells[3 * k + k // 4:4 * k]
+    }
+    yield name
+    del inertia.MAPS[name]
+    inertia._layouts.pop(name, None)
+
+
+def walk(board, start, direction):
+    """Reference slide: (end_pos, path, gem cells in order, hit_mine)"""
+    rows, cols = len(board), len(board[0])
+    r, c = start
+    path = [start]
+    gems = []
+    hit_mine = False
+    while True:
+        nr, nc = r + direction[0], c + direction[1]
+        if not (0 <= nr < rows and 0 <= nc < cols):
+            break
+        r, c = nr, nc
+        path.append((r, c))
+        if board[r][c] == GEM:
+            gems.append((r, c))
+        elif board[r][c] == MINE:
+            hit_mine = True
+            break
+        elif board[r][c] == STOP:
+            break
+    return (r, c), path, gems, hit_mine
+
+
+@pytest.mark.parametrize("flat_board", [False, True])
+def test_slides_match_board_walk(random_map, flat_board):
+    rng = random.Random(3)
+    game = InertiaGame(random_map, flat_board=flat_board)
+    board = [list(row) for row in game.board]
+    for _ in range(3000):
+        pos = game.ball_pos
+        for direction in ALL_DIRECTIONS:
+            end_pos, path, gems, hit_mine = walk(board, pos, direction)
+            result = game.slide(direction)
+            assert result.end_pos == end_pos
+            assert result.hit_mine == hit_mine
+            assert result.gems == len(gems)
+            assert result.gem_cells == gems
+            assert result.path == path
+
+        direction = rng.choice(ALL_DIRECTIONS)
+        end_pos, _, gems, hit_mine = walk(board, pos, direction)
+        if hit_mine or game.game_over:
+            game.reset()
+            board = [list(row) for row in game.board]
+            continue
+        _, collected, _, _ = game.make_move(direction, is_human=rng.random() < 0.5)
+        assert collected == len(gems)
+        for r, c in gems:
+            board[r][c] = EMPTY
+        assert [list(row) for row in game.board] == board
+
+        # An index rebuilt from a snapshot must agree with the live one
+        if rng.random() < 0.05:
+            loaded = InertiaGame(random_map, flat_board=not flat_board)
+            loaded.set_state(board, game.ball_pos)
+            for direction in ALL_DIRECTIONS:
+                assert loaded.slide(direction).gem_cells == game.slide(direction).gem_cells
+
+
+def test_fenwick_search_matches_linear_scan():
+    rng = random.Random(5)
+    for n in (1, 2, 7, 64, 300):
+        values = [rng.randint(0, 1) for _ in range(n)]
+        tree = inertia._fenwick_build(values)
+        for _ in range(50):
+            i = rng.randrange(n)
+            delta = -values[i] if values[i] else 1
+            values[i] += delta
+            inertia._fenwick_add(tree, i, delta)
+            prefix = 0
+            for j, value in enumerate(values):
+                assert inertia._fenwick_prefix(tree, j) == prefix
+                prefix += value
+            for k in range(sum(values)):
+                expected = next(
+                    j for j in range(n) if sum(values[:j + 1]) > k
+                )
+                assert inertia._fenwick_search(tree, k) == expected
+
+
+@pytest.mark.parametrize("flat_board", [False, True])
+def test_set_state_copies_and_validates(flat_board):
+    game = InertiaGame("Map 1 - Introduction", flat_board=flat_board)
+    snapshot = [tuple(row) for row in game.board]
+    game.set_state(snapshot, game.ball_pos)
+    for direction in ALL_DIRECTIONS:
+        if game.slide(direction).gems and not game.slide(direction).hit_mine:
+            game.make_move(direction)
+            break
+    assert [tuple(row) for row in InertiaGame("Map 1 - Introduction").board] == snapshot
+
+    rows = [list(row) for row in snapshot]
+    game.set_state(rows, (3, 0))
+    game.make_move(direction)
+    assert rows == [list(row) for row in snapshot]
+
+    rows[0][4] = MINE
+    with pytest.raises(ValueError):
+        game.set_state(rows, (0, 0))
@@ -0,0 +1,141 @@
+"""Line protocol of the headless match server, over a real socket"""
+import asyncio
+import json
+
+import pytest
+
+import inertia_cache
+from inertia import MAPS
+from inertia_server import DIRECTION_NAMES, InertiaServer
+
+MAP = "Map 1 - Introduction"
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setenv("INERTIA_CACHE_DIR", "")
+    monkeypatch.setattr(inertia_cache, "_default_cache", None)
+    server = InertiaServer(workers=1)
+    yield server
+    server.close()
+
+
+def run_session(server, session):
+    """Run session(send, recv) against server on an ephemeral port"""
+    async def main():
+        listener = await asyncio.start_server(server.handle_client, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        async def send(line):
+            writer.write((line + "\n").encode("utf-8"))
+            await writer.drain()
+
+        async def recv():
+            return json.loads(await asyncio.wait_for(reader.readline(), 30))
+
+        try:
+            await session(send, recv)
+        finally:
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+
+    asyncio.run(main())
+
+
+def test_commands(server):
+    async def session(send, recv):
+        async def request(line):
+            await send(line)
+            return await recv()
+
+        reply = await request("MAPS")
+        assert reply == {"ok": True, "maps": list(MAPS)}
+
+        reply = await request("NEW " + MAP)
+        assert reply["ok"]
+        state = reply["state"]
+        game_id = state["game"]
+        assert state["map"] == MAP and state["ball"] == list(MAPS[MAP]["start"])
+        assert state["human_score"] == 0 and not state["game_over"]
+
+        reply = await request(f"CPU {game_id}")
+        assert reply["ok"] and reply["success"]
+        assert reply["direction"] in DIRECTION_NAMES
+        assert reply["path"][0] == list(MAPS[MAP]["start"])
+        assert reply["state"]["cpu_moves"] == 1
+        ball = reply["state"]["ball"]
+
+        reply = await request(f"MOVE {game_id} down")
+        assert reply["ok"] and reply["success"]
+        assert reply["path"][0] == ball
+        assert reply["state"]["human_moves"] == 1
+
+        reply = await request(f"STATE {game_id}")
+        assert reply["ok"]
+        assert reply["state"]["cpu_moves"] == 1 and reply["state"]["human_moves"] == 1
+
+        assert await request(f"END {game_id}") == {"ok": True, "game": game_id}
+        reply = await request(f"STATE {game_id}")
+        assert not reply["ok"] and reply["error"] == f"unknown game: {game_id}"
+
+    run_session(server, session)
+
+
+def test_error_replies(server):
+    async def session(send, recv):
+        async def error(line):
+            await send(line)
+            reply = await recv()
+            assert reply["ok"] is False
+            return reply["error"]
+
+        assert await error("BOGUS 1") == "unknown command: BOGUS"
+        assert await error("NEW No Such Map") == "unknown map: No Such Map"
+        assert await error("STATE 999") == "unknown game: 999"
+        assert await error("STATE abc") == "invalid game id: 'abc'"
+        await send("NEW " + MAP)
+        game_id = (await recv())["state"]["game"]
+        assert await error(f"MOVE {game_id} sideways") == "invalid direction: 'sideways'"
+
+        # Unexpected failures are reported, and the connection stays usable
+        async def broken(rest):
+            raise RuntimeError("pool gone")
+        server.cmd_state = broken
+        assert await error(f"STATE {game_id}") == "internal error: RuntimeError: pool gone"
+        await send("MAPS")
+        assert (await recv())["ok"]
+
+    run_session(server, session)
+
+
+def test_tagged_requests_reply_out_of_order(server):
+    async def session(send, recv):
+        game_ids = []
+        for _ in range(2):
+            await send("NEW " + MAP)
+            game_ids.append((await recv())["state"]["game"])
+        slow, fast = game_ids
+
+        # Hold the CPU move of one match until the other match has replied
+        released = asyncio.Event()
+        cmd_cpu = server.cmd_cpu
+
+        async def gated_cpu(rest):
+            if rest == str(slow):
+                await released.wait()
+            return await cmd_cpu(rest)
+        server.cmd_cpu = gated_cpu
+
+        await send(f"@a CPU {slow}")
+        await send(f"@b CPU {fast}")
+        await send(f"@c STATE {fast}")
+        first = [await recv(), await recv()]
+        assert sorted(reply["id"] for reply in first) == ["b", "c"]
+        released.set()
+        last = await recv()
+        assert last["id"] == "a" and last["ok"]
+        assert last["state"]["game"] == slow
+
+    run_session(server, session)
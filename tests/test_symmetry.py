@@ -0,0 +1,81 @@
+"""Map symmetries and canonical state keys"""
+import random
+
+import pytest
+
+import inertia
+from inertia import ALL_DIRECTIONS, MAPS, canonical_state, get_layout
+from inertia_cache import DiskCache
+
+
+# Pinwheel layout: symmetric under quarter turns but not under reflections,
+# so its symmetries are not all their own inverses
+PINWHEEL = "Test - Pinwheel"
+PINWHEEL_DATA = {
+    "rows": 6, "cols": 6, "start": (0, 0),
+    "gems": [(0, 3), (3, 5), (5, 2), (2, 0), (2, 2)],
+    "mines": [(0, 1), (1, 5), (5, 4), (4, 0)],
+    "stops": [(1, 2), (2, 4), (4, 3), (3, 1)]
+}
+MAP_NAMES = list(MAPS) + [PINWHEEL]
+
+
+@pytest.fixture(autouse=True)
+def no_disk_cache(monkeypatch):
+    monkeypatch.setattr(inertia, "default_cache", lambda: DiskCache(None))
+
+
+@pytest.fixture(autouse=True)
+def pinwheel_map():
+    MAPS[PINWHEEL] = PINWHEEL_DATA
+    yield
+    del MAPS[PINWHEEL]
+    inertia._layouts.pop(PINWHEEL, None)
+
+
+def test_detected_symmetries():
+    for name in MAP_NAMES:
+        assert get_layout(name).symmetries[0].name == "identity"
+    assert [s.name for s in get_layout("Map 7 - Expert Grid").symmetries] == [
+        "identity", "transpose"
+    ]
+    assert [s.name for s in get_layout(PINWHEEL).symmetries] == [
+        "identity", "rotate_180", "rotate_90", "rotate_270"
+    ]
+
+
+@pytest.mark.parametrize("map_name", MAP_NAMES)
+def test_slides_are_invariant(map_name):
+    layout = get_layout(map_name)
+    cells = [(r, c) for r in range(layout.rows) for c in range(layout.cols)]
+    for symmetry in layout.symmetries:
+        for pos in cells:
+            for direction in ALL_DIRECTIONS:
+                end_pos, steps, hit_mine, risk, _ = layout.slide(pos, direction)
+                image = layout.slide(symmetry.cells[pos], symmetry.directions[direction])
+                assert image[:4] == (symmetry.cells[end_pos], steps, hit_mine, risk)
+
+
+@pytest.mark.parametrize("map_name", MAP_NAMES)
+def test_back_inverts_directions(map_name):
+    for symmetry in get_layout(map_name).symmetries:
+        assert sorted(symmetry.directions.values()) == sorted(ALL_DIRECTIONS)
+        for direction in ALL_DIRECTIONS:
+            assert symmetry.back[symmetry.directions[direction]] == direction
+
+
+@pytest.mark.parametrize("map_name", MAP_NAMES)
+def test_equivalent_states_share_canonical_key(map_name):
+    layout = get_layout(map_name)
+    gems = list(layout.gem_slots)
+    cells = [(r, c) for r in range(layout.rows) for c in range(layout.cols)]
+    rng = random.Random(11)
+    for _ in range(50):
+        pos = rng.choice(cells)
+        remaining = rng.sample(gems, rng.randint(0, len(gems)))
+        key, canonical = canonical_state(layout.symmetries, pos, remaining)
+        assert key == (canonical.cells[pos], tuple(sorted(canonical.cells[g] for g in remaining)))
+        for symmetry in layout.symmetries:
+            image_pos = symmetry.cells[pos]
+            image_gems = [symmetry.cells[g] for g in remaining]
+            assert canonical_state(layout.symmetries, image_pos, image_gems)[0] == key
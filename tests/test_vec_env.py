@@ -0,0 +1,66 @@
+"""VecInertiaEnv step for step against InertiaGame.make_move"""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import inertia
+from inertia import ALL_DIRECTIONS, GEM, MAPS, InertiaGame
+from inertia_cache import DiskCache
+from inertia_vec_env import PLANE_BALL, PLANE_GEMS, VecInertiaEnv
+
+MAX_STEPS = 50
+
+
+@pytest.fixture(autouse=True)
+def no_disk_cache(monkeypatch):
+    monkeypatch.setattr(inertia, "default_cache", lambda: DiskCache(None))
+
+
+def check_slot(env, obs, i, game):
+    r, c = game.ball_pos
+    assert env.pos[i] == r * env.width + c
+    gems = np.zeros((env.height, env.width), dtype=np.uint8)
+    for gr in range(game.rows):
+        for gc in range(game.cols):
+            gems[gr, gc] = game.board[gr][gc] == GEM
+    assert (obs[i, PLANE_GEMS] == gems).all()
+    assert obs[i, PLANE_BALL].sum() == 1 and obs[i, PLANE_BALL][r, c] == 1
+
+
+def test_matches_game_rules():
+    names = list(MAPS)
+    n = 2 * len(names)
+    env = VecInertiaEnv(n, names, max_steps=MAX_STEPS)
+    obs = env.reset()
+    games = [InertiaGame(names[i % len(names)]) for i in range(n)]
+    steps = [0] * n
+    rng = np.random.default_rng(0)
+    for i, game in enumerate(games):
+        check_slot(env, obs, i, game)
+
+    for _ in range(1000):
+        actions = rng.integers(0, len(ALL_DIRECTIONS), n)
+        obs, rewards, dones = env.step(actions)
+        for i, game in enumerate(games):
+            before = game.human_score
+            _, _, _, hit_mine = game.make_move(ALL_DIRECTIONS[actions[i]])
+            steps[i] += 1
+            assert rewards[i] == (-1.0 if hit_mine else game.human_score - before)
+            stuck = all(
+                game.simulate_move(d)[2] or game.simulate_move(d)[0] == game.ball_pos
+                for d in ALL_DIRECTIONS
+            )
+            done = hit_mine or game.game_over or stuck or steps[i] >= MAX_STEPS
+            assert dones[i] == done
+            if done:
+                game.reset()
+                steps[i] = 0
+            check_slot(env, obs, i, game)
+
+
+def test_rejects_out_of_range_actions():
+    env = VecInertiaEnv(4)
+    env.reset()
+    for bad in (len(ALL_DIRECTIONS), -1):
+        with pytest.raises(ValueError):
+            env.step(np.full(4, bad))